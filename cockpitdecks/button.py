@@ -35,6 +35,7 @@ logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
 
 DECK_BUTTON_DEFINITION = "_deck_def"  # warning: this attribute MUST match an attribute in JSON/JavaScript object in jinja templates
+INDEX_NUMBER = re.compile("\\d+(?:\\.\\d+)?$")  # just the numbers of a button index name knob3 -> 3.
 
 
 class StateVariableValueProvider(ABC, ValueProvider):
@@ -57,7 +58,8 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         self.mosaic = self._def.is_tile()
         self._part_of_multi = False
 
-        self.cockpit.set_logging_level(__name__)
+        cockpit = self.cockpit  # used a lot below, resolved once
+        cockpit.set_logging_level(__name__)
 
         self.index = config.get(
             CONFIG_KW.INDEX.value
@@ -71,9 +73,9 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         self.name = config.get(CONFIG_KW.NAME.value, str(self.index))
         self.num_index = None
         if type(self.index) is str:
-            idxnum = re.findall("\\d+(?:\\.\\d+)?$", self.index)  # just the numbers of a button index name knob3 -> 3.
-            if len(idxnum) > 0:
-                self.num_index = idxnum[0]
+            idxnum = INDEX_NUMBER.search(self.index)
+            if idxnum is not None:
+                self.num_index = idxnum.group(0)
 
         # # Logging level
         # self.logging_level = config.get("logging-level", "INFO")
@@ -90,6 +92,8 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         self.initial_value = config.get(CONFIG_KW.INITIAL_VALUE.value)
         self.current_value = None
         self.previous_value = None
+        self._value_changed = False  # whether last value assignment changed the value
+        self._value_refresh = False  # next value assignment reports a change, even if value is the same
 
         #### Options
         #
@@ -100,35 +104,36 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         #### Activation
         #
         self._activation = None
+        all_activations = cockpit.all_activations
         atype = Button.guess_activation_type(config)
-        if atype is not None and atype in self.deck.cockpit.all_activations:
-            self._activation = self.deck.cockpit.all_activations[atype](self)
+        if atype is not None and atype in all_activations:
+            self._activation = all_activations[atype](self)
             logger.debug(f"button {self.name} activation {atype}")
         else:
             logger.info(f"button {self.name} has no activation defined, using default activation 'none'")
-            self._activation = self.deck.cockpit.all_activations["none"](self)
+            self._activation = all_activations["none"](self)
 
         #### Representation
         #
         self._representation = None
 
-        idx = Button.guess_index(config)
+        all_representations = cockpit.all_representations
         rtype = Button.guess_representation_type(
-            config, all_representations=self.deck.cockpit.all_representations, all_hardware_representations=self.deck.cockpit.all_hardware_representations
+            config, all_representations=all_representations, all_hardware_representations=cockpit.all_hardware_representations
         )
-        if rtype is not None and rtype in self.deck.cockpit.all_representations:
-            self._representation = self.deck.cockpit.all_representations[rtype](self)
+        if rtype is not None and rtype in all_representations:
+            self._representation = all_representations[rtype](self)
             logger.debug(f"button {self.name} representation {rtype}")
         else:
             logger.info(f"button {self.name} has no representation defined, using default representation 'none'")
-            self._representation = self.deck.cockpit.all_representations["none"](self)
+            self._representation = all_representations["none"](self)
 
         self._hardware_representation = None
         if self.deck.is_virtual_deck() and self._def.has_hardware_representation():
             rtype = self._def.get_hardware_representation()
-            if rtype is not None and rtype in self.deck.cockpit.all_representations:
+            if rtype is not None and rtype in all_representations:
                 logger.debug(f"button {self.name} has hardware representation {rtype}")
-                self._hardware_representation = self.deck.cockpit.all_representations[rtype](self)
+                self._hardware_representation = all_representations[rtype](self)
 
         #### Datarefs
         #
@@ -174,7 +179,7 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         # collection in single set
         self.all_datarefs = self.all_datarefs | self.string_datarefs
 
-        self.wallpaper = self.deck.cockpit.locate_image(config.get(CONFIG_KW.WALLPAPER.value))
+        self.wallpaper = cockpit.locate_image(config.get(CONFIG_KW.WALLPAPER.value))
         if self.wallpaper is not None:
             self._def.set_block_wallpaper(self.wallpaper)
 
@@ -199,7 +204,7 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
 
     @staticmethod
     def guess_representation_type(config, all_representations, all_hardware_representations):
-        a = [r for r in all_representations.keys() if r in config and r not in all_hardware_representations.keys()]
+        a = [r for r in config if r in all_representations and r not in all_hardware_representations]  # config has fewer keys
         if len(a) == 1:
             return a[0]
         elif len(a) == 0:
@@ -305,7 +310,8 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         value = self._config.get(attribute)
         if value is not None:  # found!
             if silence:
-                logger.debug(f"button {self.name} returning {attribute}={value}")
+                if logger.isEnabledFor(logging.DEBUG):  # called at each rendering
+                    logger.debug(f"button {self.name} returning {attribute}={value}")
             else:
                 logger.info(f"button {self.name} returning {attribute}={value}")
             return self.deck.cockpit.convert_if_color_attribute(attribute=attribute, value=value, silence=silence)
@@ -349,7 +355,8 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         """
         Gets the current value, but does not provoke a calculation, just returns the current value.
         """
-        logger.debug(f"button {self.name}: {self.current_value}")
+        if logger.isEnabledFor(logging.DEBUG):  # called several times per rendering
+            logger.debug(f"button {self.name}: {self.current_value}")
         return self.current_value
 
     @value.setter
@@ -357,19 +364,17 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         if self._first_value_not_saved:
             self._first_value = value
             self._first_value_not_saved = False
-        if value != self.current_value:
+        self._value_changed = self._value_refresh or value != self.current_value
+        self._value_refresh = False
+        if self._value_changed:
             self.previous_value = self.current_value
             self.current_value = value
             logger.debug(f"button {self.name}: {self.current_value}")
 
     def has_changed(self) -> bool:
-        if self.previous_value is None and self.current_value is None:
-            return False
-        elif self.previous_value is None and self.current_value is not None:
-            return True
-        elif self.previous_value is not None and self.current_value is None:
-            return True
-        return self.current_value != self.previous_value
+        # previous_value is the previous *different* value (see trend()),
+        # comparing it to current_value would report a change on every update after the first change.
+        return self._value_changed
 
     def is_valid(self) -> bool:
         """
@@ -501,11 +506,9 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
             logger.debug(f"button {self.name}: is managed is none.")
             return False
         d = self.get_simulator_variable_value(simulator_variable=self.managed, default=0)
-        if d != 0:
-            logger.debug(f"button {self.name}: is managed ({d}).")
-            return True
-        logger.debug(f"button {self.name}: is not managed ({d}).")
-        return False
+        if logger.isEnabledFor(logging.DEBUG):  # called at each rendering
+            logger.debug(f"button {self.name}: is {'' if d != 0 else 'not '}managed ({d}).")
+        return d != 0
         # return self.managed is not None and self.get_simulator_variable_value(simulator_variable=dataref=self.managed, default=0) != 0
 
     def has_guard(self):
@@ -688,11 +691,10 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
                 SPAM_LEVEL,
                 f"activate: button {self.name}: {self.previous_value} -> {self.current_value}",
             )
-            self.render()
         else:
-            logger.debug(f"button {self.name}: no change")
-            if self.deck.is_virtual_deck():  # representation has not changed, but hardware representation might have
-                self.render()
+            logger.debug(f"button {self.name}: no value change")
+        # Always render after an activation: guard, labels, and texts may depend on activation state, not only on value
+        self.render()
         return True
 
     def get_state_variables(self):
@@ -786,7 +788,8 @@ class Button(SimulatorVariableListener, SimulatorVariableValueProvider, StateVar
         Button removes itself from device
         """
         # self.inc(INTERNAL_DATAREF.BUTTON_CLEAN.value, cascade=False)
-        self.previous_value = None  # this will provoke a refresh of the value on data reload
+        self.previous_value = None
+        self._value_refresh = True  # this will provoke a refresh of the value on data reload
         self._representation.clean()
 
 
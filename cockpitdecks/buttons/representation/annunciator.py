@@ -2,26 +2,45 @@
 # Annunciator Rendering
 #
 import logging
-import threading
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, Set
 from enum import Enum
 from PIL import Image, ImageDraw, ImageFilter
 
 from cockpitdecks import CONFIG_KW, ANNUNCIATOR_STYLES, ICON_SIZE
-from cockpitdecks.resources.color import convert_color, light_off, is_number
+from cockpitdecks.resources.color import convert_color, light_off
 from cockpitdecks.simulator import SimulatorVariable
 from cockpitdecks.value import Value
 
 from .draw import DrawBase
+from .icon_animation import ICON_ANIMATION_SCHEDULER
 
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
+RENDER_DEBUG = False  # set to True to log per frame rendering details (with debug level above)
 
 # Local default values
 ANNUNCIATOR_DEFAULT_MODEL = "A"
 ANNUNCIATOR_DEFAULT_MODEL_PART = "A0"
 ANNUNCIATOR_DEFAULT_TEXT_COLOR = "white"
 DEFAULT_INVERT_COLOR = "white"
+TRUTHY_STRINGS = frozenset(("true", "on", "yes", "1"))
+
+# Number of parts for each annunciator type
+ANNUNCIATOR_PART_COUNTS = {"A": 1, "B": 2, "C": 2, "D": 3, "E": 3, "F": 4}
+
+# Annunciator sizes: (annunciator height, label box height, vertically centered), in 1/16th of icon size
+ANNUNCIATOR_SIZES = {
+    "small": (8, 4, True),  # 1/2, starts at 128
+    "medium": (10, 3, True),  # 5/8, starts at 96
+    "full": (16, 0, True),  # starts at 0
+    "large": (14, 2, False),  # full size, leaves 2/16 at the top
+}
+
+# Number of rendered images kept per annunciator (lit/unlit for blinking ones)
+ANNUNCIATOR_IMAGE_CACHE_SIZE = 4
+
+# Korry glow: wide halo and tight halo, both composited over the glowing texts
+KORRY_GLOW_BLURS = (ImageFilter.GaussianBlur(10), ImageFilter.GaussianBlur(4))
 
 
 class GUARD_TYPES(Enum):
@@ -38,6 +57,17 @@ class ANNUNCIATOR_LED(Enum):
     LGEAR = "lgear"  # Triangular (hollow, downward pointing) shape used for landing gear representation
 
 
+# Drawing function of each led type
+ANNUNCIATOR_LED_DRAWERS = {
+    ANNUNCIATOR_LED.BLOCK.value: "draw_led_block",
+    ANNUNCIATOR_LED.LED.value: "draw_led_block",
+    "bar": "draw_led_bars",
+    ANNUNCIATOR_LED.BARS.value: "draw_led_bars",
+    ANNUNCIATOR_LED.DOT.value: "draw_led_dot",
+    ANNUNCIATOR_LED.LGEAR.value: "draw_led_lgear",
+}
+
+
 class AnnunciatorPart:
     ANNUNCIATOR_PARTS = {
         "A0": [0.50, 0.50],
@@ -71,14 +101,45 @@ class AnnunciatorPart:
         self._height = None
         self._center_w = None
         self._center_h = None
+        self._sized_for = None
+        self._text_bbox = None
+        self._led_shape = None  # led geometry, depends on sizes only
+        self._framemax = None  # largest text frame and its thickness, depends on sizes only
 
-        if self.name not in AnnunciatorPart.ANNUNCIATOR_PARTS.keys():
+        if self.name not in AnnunciatorPart.ANNUNCIATOR_PARTS:
             logger.error(f"invalid annunciator part name {self.name}")
 
+        self.resolve_config()
+
+    def resolve_config(self):
+        """
+        Configuration does not change after load, resolve rendering attributes once.
+        """
+        self._vivisun = self.annunciator.annunciator_style == ANNUNCIATOR_STYLES.VIVISUN
+        self._led = self._config.get("led")
+        drawer = ANNUNCIATOR_LED_DRAWERS.get(self._led)
+        self._led_drawer = getattr(self, drawer) if drawer is not None else None
+        self._text_font = self._config.get("text-font")
+        self._text_size = self._config.get("text-size")
+        self._bars = int(self._config.get("bars", 3))
+        self._framed = self.has_frame()
+        self._invert = "invert" in self._config or "invert-color" in self._config
+        if self._invert:
+            invert = self._config.get("invert") if "invert" in self._config else self._config.get("invert-color")
+            self._invert_color = convert_color(invert)
+        else:
+            self._invert_color = convert_color(DEFAULT_INVERT_COLOR)
+        self.resolve_colors()
+
     def set_sizes(self, annun_width, annun_height):
-        if self.name not in AnnunciatorPart.ANNUNCIATOR_PARTS.keys():
+        if self._sized_for == (annun_width, annun_height):  # pixel sizes already computed
+            return
+        if self.name not in AnnunciatorPart.ANNUNCIATOR_PARTS:
             logger.error(f"invalid annunciator part name {self.name}, sizes not set")
             return
+        self._sized_for = (annun_width, annun_height)
+        self._led_shape = None
+        self._framemax = None
         w, h = AnnunciatorPart.ANNUNCIATOR_PARTS[self.name]
         self._width = annun_width if w == 0.5 else annun_width / 2
         self._height = annun_height if h == 0.5 else annun_height / 2
@@ -128,7 +189,10 @@ class AnnunciatorPart:
     @property
     def value(self):
         r = self._value.get_value()
-        self.lit = r is not None and is_number(r) and float(r) > 0
+        try:
+            self.lit = r is not None and float(r) > 0
+        except (TypeError, ValueError):
+            self.lit = False
         # print("PART", self.annunciator.button.name, self.name, r, self.lit, self._value.name, self._value.formula, self._value)
         return r
 
@@ -137,24 +201,21 @@ class AnnunciatorPart:
         return self.lit
 
     def is_invert(self):
-        return "invert" in self._config or "invert-color" in self._config
+        return self._invert
 
     def invert_color(self):
-        if self.is_invert():
-            if "invert" in self._config:
-                return convert_color(self._config.get("invert"))
-            else:
-                return convert_color(self._config.get("invert-color"))
-        logger.debug(f"button {self.annunciator.button.name}: no invert color, returning {DEFAULT_INVERT_COLOR}")
-        return convert_color(DEFAULT_INVERT_COLOR)
+        return self._invert_color
 
     def get_text(self, attr: str):  # = "text"
         return self.annunciator.button.get_text(self._config, attr)
 
     def get_led(self):
-        return self._config.get("led")
+        return self._led
 
-    def get_color(self):
+    def resolve_colors(self):
+        """
+        Lit and unlit colors only depend on configuration, resolve them once.
+        """
         color = self._config.get("color")
 
         text_color = self._config.get("text-color")
@@ -166,28 +227,21 @@ class AnnunciatorPart:
         elif color is None:
             color = ANNUNCIATOR_DEFAULT_TEXT_COLOR
 
-        before = color
-        if not self.is_lit:
+        self._lit_color = convert_color(color)
+
+        off_color = self._config.get("off-color")
+        if off_color is None:
             try:
                 lux = self.annunciator.button.get_attribute("light-off-intensity")
-                dimmed = light_off(color, lightness=lux / 100)
-                color = self._config.get("off-color")
-                if color is None:
-                    logger.debug(f"button {self.annunciator.button.name}: no off-color, using dimmed")
-                    color = dimmed
-            except ValueError:
+                off_color = light_off(color, lightness=lux / 100)
+                logger.debug(f"button {self.annunciator.button.name}: no off-color, using dimmed")
+            except (TypeError, ValueError):
                 logger.debug(f"button {self.annunciator.button.name}: color {color} cannot change brightness")
-                color = before
+                off_color = color
+        self._unlit_color = convert_color(off_color)
 
-        # print(
-        #     f">>>> {self.annunciator.button.get_id()}",
-        #     self._config.get("color"),
-        #     text_color,
-        #     self.annunciator.button.get_attribute("text-color"),
-        #     color,
-        # )
-
-        return convert_color(color)
+    def get_color(self):
+        return self._lit_color if self.is_lit else self._unlit_color
 
     def has_frame(self):
         """
@@ -196,22 +250,42 @@ class AnnunciatorPart:
         :param      part:  The part
         :type       part:  dict
         """
-        framed = self._config.get("framed")
+        framed = self._config.get("framed", self._config.get("frame"))
         if framed is None:
-            framed = self._config.get("frame")
-            if framed is None:
-                return False
-        if type(framed) is bool:
+            return False
+        if isinstance(framed, bool):
             return framed
-        elif type(framed) is int:
+        if isinstance(framed, int):
             return framed == 1
-        elif type(framed) is str:
-            return framed.lower() in ["true", "on", "yes", "1"]
+        if isinstance(framed, str):
+            return framed.lower() in TRUTHY_STRINGS
         return False
 
+    def get_text_bbox(self, draw, text: str, font, fontsize: int):
+        """
+        Returns the bounding box of the text centered in the part.
+        Cached since text rarely changes and measuring lays out all glyphs.
+        """
+        key = (text, fontsize, self.center_w(), self.center_h())
+        if self._text_bbox is None or self._text_bbox[0] != key:
+            txtbb = draw.multiline_textbbox(
+                (self.center_w(), self.center_h()),
+                text=text,
+                font=font,
+                anchor="mm",
+                align="center",  # min frame, just around the text
+            )
+            self._text_bbox = (key, txtbb)
+        return self._text_bbox[1]
+
     def render(self, draw, bgrd_draw, icon_size, annun_width, annun_height, inside, size):
+        if not self.is_lit and self._vivisun:
+            # Vivisun parts that are not lit display nothing
+            if RENDER_DEBUG and not isinstance(self.annunciator, AnnunciatorAnimate):
+                logger.debug(f"button {self.annunciator.button.name}: part {self.name}: not lit (type vivisun)")
+            return
+
         self.set_sizes(annun_width, annun_height)
-        TEXT_SIZE = int(self.height() / 2)  # @todo: find optimum variable text size depending on text length
         color = self.get_color()
         # logger.debug(f"button {self.button.name}: annunc {annun_width}x{annun_height}, offset ({width_offset}, {height_offset}), box {box}")
         # logger.debug(f"button {self.button.name}: part {partname}: {self.width()}x{self.height()}, center ({self.center_w()}, {self.center_h()})")
@@ -221,77 +295,60 @@ class AnnunciatorPart:
             #
             # Annunciator part will display text
             #
-            fontname = self._config.get("text-font")
-            fontsize = int(self._config.get("text-size", TEXT_SIZE))
-            font = self.annunciator.get_font(fontname, fontsize)
-
-            if self.is_lit or not self.annunciator.annunciator_style == ANNUNCIATOR_STYLES.VIVISUN:
-                if self.is_lit and self.is_invert():
-                    frame = (
-                        (
-                            self.center_w() - self.width() / 2,
-                            self.center_h() - self.height() / 2,
-                        ),
-                        (
-                            self.center_w() + self.width() / 2,
-                            self.center_h() + self.height() / 2,
-                        ),
-                    )
-                    bgrd_draw.rectangle(frame, fill=self.invert_color())
-                    logger.debug(f"button {self.annunciator.button.name}: part {self.name}: lit reverse")
+            TEXT_SIZE = int(self.height() / 2)  # @todo: find optimum variable text size depending on text length
+            fontsize = int(self._text_size) if self._text_size is not None else TEXT_SIZE
+            font = self.annunciator.get_font(self._text_font, fontsize)
 
-                # logger.debug(f"button {self.button.name}: text '{text}' at ({self.center_w()}, {self.center_h()})")
-                if not self.is_lit and type(self.annunciator) != AnnunciatorAnimate:
-                    logger.debug(f"button {self.annunciator.button.name}: part {self.name}: not lit (Korry)")
-                draw.multiline_text(
-                    (self.center_w(), self.center_h()),
-                    text=text,
-                    font=font,
-                    anchor="mm",
-                    align="center",
-                    fill=color,
+            if self.is_lit and self.is_invert():
+                frame = (
+                    self.center_w() - self.width() / 2,
+                    self.center_h() - self.height() / 2,
+                    self.center_w() + self.width() / 2,
+                    self.center_h() + self.height() / 2,
                 )
+                bgrd_draw.rectangle(frame, fill=self.invert_color())
+                if RENDER_DEBUG:
+                    logger.debug(f"button {self.annunciator.button.name}: part {self.name}: lit reverse")
 
-                if self.has_frame():
-                    txtbb = draw.multiline_textbbox(
-                        (self.center_w(), self.center_h()),
-                        text=text,
-                        font=font,
-                        anchor="mm",
-                        align="center",  # min frame, just around the text
-                    )
-                    text_margin = 3 * inside  # margin "around" text, line will be that far from text
-                    framebb = (
-                        (txtbb[0] - text_margin, txtbb[1] - text_margin),
-                        (txtbb[2] + text_margin, txtbb[3] + text_margin),
-                    )
+            # logger.debug(f"button {self.button.name}: text '{text}' at ({self.center_w()}, {self.center_h()})")
+            if RENDER_DEBUG and not self.is_lit and not isinstance(self.annunciator, AnnunciatorAnimate):
+                logger.debug(f"button {self.annunciator.button.name}: part {self.name}: not lit (Korry)")
+            draw.multiline_text(
+                (self.center_w(), self.center_h()),
+                text=text,
+                font=font,
+                anchor="mm",
+                align="center",
+                fill=color,
+            )
+
+            if self._framed:
+                txtbb = self.get_text_bbox(draw, text, font, fontsize)
+                text_margin = 3 * inside  # margin "around" text, line will be that far from text
+                framebb = (
+                    txtbb[0] - text_margin,
+                    txtbb[1] - text_margin,
+                    txtbb[2] + text_margin,
+                    txtbb[3] + text_margin,
+                )
+                if self._framemax is None:
                     side_margin = 4 * inside  # margin from side of part of annunciator
                     framemax = (
-                        (
-                            self.center_w() - self.width() / 2 + side_margin,
-                            self.center_h() - self.height() / 2 + side_margin,
-                        ),
-                        (
-                            self.center_w() + self.width() / 2 - side_margin,
-                            self.center_h() + self.height() / 2 - side_margin,
-                        ),
-                    )
-                    frame = (
-                        (
-                            min(framebb[0][0], framemax[0][0]),
-                            min(framebb[0][1], framemax[0][1]),
-                        ),
-                        (
-                            max(framebb[1][0], framemax[1][0]),
-                            max(framebb[1][1], framemax[1][1]),
-                        ),
+                        self.center_w() - self.width() / 2 + side_margin,
+                        self.center_h() - self.height() / 2 + side_margin,
+                        self.center_w() + self.width() / 2 - side_margin,
+                        self.center_h() + self.height() / 2 - side_margin,
                     )
-                    thick = int(self.height() / 16)
-                    # logger.debug(f"button {self.button.name}: part {partname}: {framebb}, {framemax}, {frame}")
-                    draw.rectangle(frame, outline=color, width=thick)
-            else:
-                if not self.is_lit and type(self.annunciator) != AnnunciatorAnimate:
-                    logger.debug(f"button {self.annunciator.button.name}: part {self.name}: not lit (type vivisun)")
+                    self._framemax = (framemax, int(self.height() / 16))
+                framemax, thick = self._framemax
+                frame = (
+                    min(framebb[0], framemax[0]),
+                    min(framebb[1], framemax[1]),
+                    max(framebb[2], framemax[2]),
+                    max(framebb[3], framemax[3]),
+                )
+                # logger.debug(f"button {self.button.name}: part {partname}: {framebb}, {framemax}, {frame}")
+                draw.rectangle(frame, outline=color, width=thick)
             return
 
         led = self.get_led()
@@ -299,65 +356,74 @@ class AnnunciatorPart:
             logger.warning(f"button {self.annunciator.button.name}: part {self.name}: no text, no led")
             return
 
-        if self.is_lit or not self.annunciator.annunciator_style == ANNUNCIATOR_STYLES.VIVISUN:
+        drawer = self._led_drawer
+        if drawer is None:
+            logger.warning(f"button {self.annunciator.button.name}: part {self.name}: invalid led {led}")
+            return
+        drawer(draw, color, inside, size)
+
+    def draw_led_block(self, draw, color, inside, size):
+        ninside = 6
+        LED_BLOC_HEIGHT = int(self.height() / 2)
+        if size == "large":
+            LED_BLOC_HEIGHT = int(LED_BLOC_HEIGHT * 1.25)
+        frame = (
+            self.center_w() - self.width() / 2 + ninside * inside,
+            self.center_h() - LED_BLOC_HEIGHT / 2,
+            self.center_w() + self.width() / 2 - ninside * inside,
+            self.center_h() + LED_BLOC_HEIGHT / 2,
+        )
+        draw.rectangle(frame, fill=color)
+
+    def draw_led_bars(self, draw, color, inside, size):
+        if self._led_shape is None:  # bar boxes only depend on part size
             ninside = 6
-            if led in [ANNUNCIATOR_LED.BLOCK.value, ANNUNCIATOR_LED.LED.value]:
-                LED_BLOC_HEIGHT = int(self.height() / 2)
-                if size == "large":
-                    LED_BLOC_HEIGHT = int(LED_BLOC_HEIGHT * 1.25)
-                frame = (
-                    (
-                        self.center_w() - self.width() / 2 + ninside * inside,
-                        self.center_h() - LED_BLOC_HEIGHT / 2,
-                    ),
-                    (
-                        self.center_w() + self.width() / 2 - ninside * inside,
-                        self.center_h() + LED_BLOC_HEIGHT / 2,
-                    ),
-                )
-                draw.rectangle(frame, fill=color)
-            elif led in ["bar", ANNUNCIATOR_LED.BARS.value]:
-                LED_BAR_COUNT = int(self._config.get("bars", 3))
-                LED_BAR_HEIGHT = max(int(self.height() / (2 * LED_BAR_COUNT)), 2)
-                if size == "large":
-                    LED_BAR_HEIGHT = int(LED_BAR_HEIGHT * 1.25)
-                LED_BAR_SPACER = max(int(LED_BAR_HEIGHT / 3), 2)
-                hstart = self.center_h() - (LED_BAR_COUNT * LED_BAR_HEIGHT + (LED_BAR_COUNT - 1) * LED_BAR_SPACER) / 2
-                for i in range(LED_BAR_COUNT):
-                    frame = (
-                        (self.center_w() - self.width() / 2 + ninside * inside, hstart),
-                        (
-                            self.center_w() + self.width() / 2 - ninside * inside,
-                            hstart + LED_BAR_HEIGHT,
-                        ),
-                    )
-                    draw.rectangle(frame, fill=color)
-                    hstart = hstart + LED_BAR_HEIGHT + LED_BAR_SPACER
-            elif led == ANNUNCIATOR_LED.DOT.value:
-                DOT_RADIUS = int(min(self.width(), self.height()) / 5)
-                # Plot a series of circular dot on a line
-                frame = (
-                    (self.center_w() - DOT_RADIUS, self.center_h() - DOT_RADIUS),
-                    (self.center_w() + DOT_RADIUS, self.center_h() + DOT_RADIUS),
-                )
-                draw.ellipse(frame, fill=color)
-            elif led == ANNUNCIATOR_LED.LGEAR.value:
-                STROKE_THICK = int(min(self.width(), self.height()) / 8) + 1
-                tr_hwidth = int(self.width() / 2.5 - ninside)  # triangle half length of width
-                tr_hheight = int(self.height() / 2.5 - ninside)  # triangle half height
-                origin = (self.center_w() - tr_hwidth, self.center_h() - tr_hheight)
-                triangle = [
-                    origin,
-                    (self.center_w() + tr_hwidth, self.center_h() - tr_hheight),
-                    (
-                        self.center_w(),
-                        self.center_h() + tr_hheight,
-                    ),  # lower center point
-                    origin,
-                ]
-                draw.polygon(triangle, outline=color, width=STROKE_THICK)
-            else:
-                logger.warning(f"button {self.annunciator.button.name}: part {self.name}: invalid led {led}")
+            LED_BAR_COUNT = self._bars
+            LED_BAR_HEIGHT = max(int(self.height() / (2 * LED_BAR_COUNT)), 2)
+            if size == "large":
+                LED_BAR_HEIGHT = int(LED_BAR_HEIGHT * 1.25)
+            LED_BAR_SPACER = max(int(LED_BAR_HEIGHT / 3), 2)
+            hstart = self.center_h() - (LED_BAR_COUNT * LED_BAR_HEIGHT + (LED_BAR_COUNT - 1) * LED_BAR_SPACER) / 2
+            left = self.center_w() - self.width() / 2 + ninside * inside
+            right = self.center_w() + self.width() / 2 - ninside * inside
+            bars = []
+            for i in range(LED_BAR_COUNT):
+                bars.append((left, hstart, right, hstart + LED_BAR_HEIGHT))
+                hstart = hstart + LED_BAR_HEIGHT + LED_BAR_SPACER
+            self._led_shape = tuple(bars)
+        for bar in self._led_shape:
+            draw.rectangle(bar, fill=color)
+
+    def draw_led_dot(self, draw, color, inside, size):
+        DOT_RADIUS = int(min(self.width(), self.height()) / 5)
+        # Plot a series of circular dot on a line
+        frame = (
+            self.center_w() - DOT_RADIUS,
+            self.center_h() - DOT_RADIUS,
+            self.center_w() + DOT_RADIUS,
+            self.center_h() + DOT_RADIUS,
+        )
+        draw.ellipse(frame, fill=color)
+
+    def draw_led_lgear(self, draw, color, inside, size):
+        if self._led_shape is None:  # triangle only depends on part size
+            ninside = 6
+            STROKE_THICK = int(min(self.width(), self.height()) / 8) + 1
+            tr_hwidth = int(self.width() / 2.5 - ninside)  # triangle half length of width
+            tr_hheight = int(self.height() / 2.5 - ninside)  # triangle half height
+            origin = (self.center_w() - tr_hwidth, self.center_h() - tr_hheight)
+            triangle = [
+                origin,
+                (self.center_w() + tr_hwidth, self.center_h() - tr_hheight),
+                (
+                    self.center_w(),
+                    self.center_h() + tr_hheight,
+                ),  # lower center point
+                origin,
+            ]
+            self._led_shape = (triangle, STROKE_THICK)
+        triangle, stroke_thick = self._led_shape
+        draw.polygon(triangle, outline=color, width=stroke_thick)
 
 
 class Annunciator(DrawBase):
@@ -395,7 +461,22 @@ class Annunciator(DrawBase):
 
         self.annun_color = button._config.get("annunciator-color", button.get_attribute("annunciator-color"))
         self.annun_color = convert_color(self.annun_color)
+        # transparent version of annunciator color used to clear drawing layers
+        self.annun_layer_color = (*self.annun_color, 0) if len(self.annun_color) == 3 else self.annun_color
         self.annun_texture = button._config.get("annunciator-texture", button.get_attribute("annunciator-texture"))
+        self.seal = None
+        if button.has_option("seal"):
+            self.seal = (int(button._config.get("seal-width", 16)), button._config.get("seal-color", "darkslategray"))
+
+        # Drawing buffers, reused from one render to the next
+        self._background = None  # static, copied at each render
+        self._icon_background = None  # static, copied at each render
+        self._glow = None
+        self._glow_draw = None
+        self._guard = None
+        self._guard_draw = None
+        self._guard_style = None
+        self._images = {}  # rendering inputs: image, last few renderings
 
         # Normalize annunciator parts in parts attribute if not present
         if self.annunciator is None:
@@ -412,12 +493,12 @@ class Annunciator(DrawBase):
                 if p is not None:
                     arr[part_name] = AnnunciatorPart(name=part_name, config=p, annunciator=self)
             if len(arr) > 0:
-                ctrl = list(set([k[0] for k in arr.keys()]))
+                ctrl = list({k[0] for k in arr})
                 if len(ctrl) != 1:
                     logger.error(f"button {self.button.name}: multiple annunciator models {ctrl}")
                 self.model = ctrl[0]
                 self.annunciator_parts = arr
-                logger.debug(f"button {self.button.name}: annunciator parts normalized ({list(self.annunciator_parts.keys())})")
+                logger.debug(f"button {self.button.name}: annunciator parts normalized ({list(self.annunciator_parts)})")
             else:
                 self.annunciator[CONFIG_KW.ANNUNCIATOR_MODEL.value] = ANNUNCIATOR_DEFAULT_MODEL
                 self.model = ANNUNCIATOR_DEFAULT_MODEL
@@ -429,11 +510,11 @@ class Annunciator(DrawBase):
                 self.annunciator_parts = arr
                 logger.debug(f"button {self.button.name}: annunciator has no part, assuming single {ANNUNCIATOR_DEFAULT_MODEL_PART} part")
         else:
-            ctrl = list(set([k[0] for k in parts.keys()]))
+            ctrl = list({k[0] for k in parts})
             if len(ctrl) != 1:
                 logger.error(f"button {self.button.name}: multiple annunciator models {ctrl}")
             self.model = ctrl[0]
-            self.annunciator_parts = dict([(k, AnnunciatorPart(name=k, config=v, annunciator=self)) for k, v in parts.items()])
+            self.annunciator_parts = {k: AnnunciatorPart(name=k, config=v, annunciator=self) for k, v in parts.items()}
 
         # for a in [CONFIG_KW.SIM_VARIABLE.value, CONFIG_KW.FORMULA.value]:
         #     if a in button._config:
@@ -445,17 +526,19 @@ class Annunciator(DrawBase):
         if self.model is None:
             logger.error(f"button {self.button.name}: annunciator has no model")
 
-        self.annunciator_datarefs: List[SimulatorVariable] | None = None
+        self.set_annunciator_geometry()
+
+        self.annunciator_datarefs: FrozenSet[SimulatorVariable] | None = None
         self.annunciator_datarefs = self.get_simulator_variable()
 
         DrawBase.__init__(self, button=button)
 
     def is_valid(self):
         if self.button is None:
-            logger.warning(f"button {self.button.name}: {type(self).__name__}: no button")
+            logger.warning(f"button {self.button.name}: {self._NAME}: no button")
             return False
         if self.annunciator is None:
-            logger.warning(f"button {self.button.name}: {type(self).__name__}: no annunciator attribute")
+            logger.warning(f"button {self.button.name}: {self._NAME}: no annunciator attribute")
             return False
         return True
 
@@ -465,20 +548,15 @@ class Annunciator(DrawBase):
         """
         if self._part_iterator is None:
             t = self.annunciator.get(CONFIG_KW.ANNUNCIATOR_MODEL.value, ANNUNCIATOR_DEFAULT_MODEL)
-            if t not in "ABCDEF":
+            n = ANNUNCIATOR_PART_COUNTS.get(t)
+            if n is None:
                 logger.warning(f"button {self.button.name}: invalid annunciator type {t}")
-                return []
-            n = 1
-            if t in "BC":
-                n = 2
-            elif t in "DE":
-                n = 3
-            elif t == "F":
-                n = 4
-            self._part_iterator = [t + str(partnum) for partnum in range(n)]
+                self._part_iterator = ()
+            else:
+                self._part_iterator = tuple(t + str(partnum) for partnum in range(n))
         return self._part_iterator
 
-    def get_simulator_variable(self) -> Set[SimulatorVariable]:
+    def get_simulator_variable(self) -> FrozenSet[SimulatorVariable]:
         """
         Complement button datarefs with annunciator special lit datarefs
         """
@@ -490,20 +568,24 @@ class Annunciator(DrawBase):
             for k, v in self.annunciator_parts.items():
                 datarefs = v.get_simulator_variable()
                 if len(datarefs) > 0:
-                    r = r | datarefs
+                    r.update(datarefs)
                     logger.debug(f"button {self.button.name}: added {k} datarefs {datarefs}")
         else:
             logger.warning("no annunciator parts to get datarefs from")
-        self.annunciator_datarefs = r
+        self.annunciator_datarefs = frozenset(r)
         return self.annunciator_datarefs
 
     def get_current_values(self):
         """
         There is a get_current_value value per annunciator part.
         """
-        v = {k: v.value for k, v in self.annunciator_parts.items()}
-        l = {k: v.is_lit for k, v in self.annunciator_parts.items()}
-        logger.debug(f"button {self.button.name}: {type(self).__name__}: {v} => {l}")
+        v = {}
+        l = {}
+        for k, part in self.annunciator_parts.items():
+            v[k] = part.value  # evaluates the part and sets its lit state
+            l[k] = part.is_lit
+        if RENDER_DEBUG:
+            logger.debug(f"button {self.button.name}: {self._NAME}: {v} => {l}")
         return v
 
     def get_annunciator_background(self, width: int, height: int, use_texture: bool = True):
@@ -527,57 +609,105 @@ class Annunciator(DrawBase):
         logger.debug(f"using uniform color {self.annun_color}")
         return image
 
+    def set_annunciator_geometry(self):
+        """
+        Button overall size: full, large, medium, small.
+        Box is the top area where label will go if any.
+        """
+        self.annun_size = self.annunciator.get("size", "full")
+        height16, box16, centered = ANNUNCIATOR_SIZES.get(self.annun_size, ANNUNCIATOR_SIZES["large"])
+        self.annun_height = int(height16 * ICON_SIZE / 16)
+        self.annun_width = ICON_SIZE
+        if not centered and self.button.has_option("square"):
+            self.annun_width = self.annun_height
+        self.annun_width_offset = (ICON_SIZE - self.annun_width) / 2
+        self.annun_height_offset = (ICON_SIZE - self.annun_height) / 2 if centered else ICON_SIZE - self.annun_height
+        self.annun_box = (0, int(box16 * ICON_SIZE / 16))
+
+    def get_guard_style(self):
+        """
+        Returns guard model, color, grid width and top height.
+        Resolved on first use since button guard is set after its representation.
+        """
+        if self._guard_style is None:
+            guarded = self.button.guarded
+            self._guard_style = (
+                guarded.get(CONFIG_KW.ANNUNCIATOR_MODEL.value, GUARD_TYPES.COVER.value),  # CONFIG_KW.ANNUNCIATOR_MODEL.value = "model"
+                convert_color(guarded.get("color", "red")),
+                guarded.get("grid-width", 16),
+                guarded.get("top", int(ICON_SIZE / 8)),
+            )
+        return self._guard_style
+
+    def get_glow_layer(self, width: int, height: int, color):
+        """
+        Returns the reusable glow layer and its drawing context, cleared to color
+        """
+        if self._glow is None or self._glow.size != (width, height):
+            self._glow = Image.new(mode="RGBA", size=(width, height), color=color)
+            self._glow_draw = ImageDraw.Draw(self._glow)
+        else:
+            self._glow.paste(color, (0, 0) + self._glow.size)
+        return self._glow, self._glow_draw
+
+    def get_guard_layer(self, color):
+        """
+        Returns the reusable guard layer and its drawing context, cleared to color
+        """
+        if self._guard is None:
+            self._guard = Image.new(mode="RGBA", size=(ICON_SIZE, ICON_SIZE), color=color)
+            self._guard_draw = ImageDraw.Draw(self._guard)
+        else:
+            self._guard.paste(color, (0, 0) + self._guard.size)
+        return self._guard, self._guard_draw
+
+    def get_render_key(self) -> tuple:
+        """
+        Returns what changes from one rendering to the next: part lit states, part texts and guard.
+        """
+        return tuple((part.is_lit, part.get_text("text")) for part in self.annunciator_parts.values()) + (self.button.is_guarded(),)
+
     def get_image_for_icon(self):
+        # Returned image is the cached one, it is read-only: marks and label are drawn on a copy
+        # (IconBase.mark_image(), overlay_text()), decks copy before resizing or rounding corners.
+        # It can be reused as long as rendering inputs have not changed.
+        # Keeping a few of them lets blinking annunciators alternate between
+        # their lit and unlit images without rendering (and blurring) again.
+        key = self.get_render_key()
+        image = self._images.get(key)
+        if image is not None:
+            return image
+        image = self.make_annunciator()
+        if len(self._images) >= ANNUNCIATOR_IMAGE_CACHE_SIZE:
+            del self._images[next(iter(self._images))]  # oldest
+        self._images[key] = image
+        return image
+
+    def make_annunciator(self):
         # If the part is not lit, a darker version is printed unless dark option is added to button
         # in which case nothing gets added to the button.
         # CONSTANTS
         SEAL_WIDTH = 8  # px
-        SQUARE = self.button.has_option("square")
         inside = ICON_SIZE / 32  # ~8px for 256x256 image
-        page = self.button.page
-
-        # Button overall size: full, large, medium, small.
-        # Box is the top area where label will go if any
-        size = self.annunciator.get("size", "full")
-        annun_width = ICON_SIZE
-        spare16 = 2
-        if size == "small":  # 1/2, starts at 128
-            annun_height = int(ICON_SIZE / 2)
-            height_offset = (ICON_SIZE - annun_height) / 2
-            width_offset = (ICON_SIZE - annun_width) / 2
-            box = (0, int(ICON_SIZE / 4))
-        elif size == "medium":  # 5/8, starts at 96
-            annun_height = int(10 * ICON_SIZE / 16)
-            height_offset = (ICON_SIZE - annun_height) / 2
-            width_offset = (ICON_SIZE - annun_width) / 2
-            box = (0, int(3 * ICON_SIZE / 16))
-        elif size == "full":  # starts at 0
-            annun_height = ICON_SIZE
-            height_offset = 0
-            width_offset = 0
-            box = (0, 0)
-            # box2 = (0, int(spare16 * ICON_SIZE / 16))
-        else:  # "large", full size, leaves spare16*1/16 at the top
-            annun_height = int((16 - spare16) * ICON_SIZE / 16)
-            if SQUARE:
-                annun_width = annun_height
-            height_offset = ICON_SIZE - annun_height
-            width_offset = (ICON_SIZE - annun_width) / 2
-            box = (0, int(spare16 * ICON_SIZE / 16))
+
+        size = self.annun_size
+        annun_width = self.annun_width
+        annun_height = self.annun_height
+        width_offset = self.annun_width_offset
+        height_offset = self.annun_height_offset
 
         # PART 1:
         # Texts that will glow if Korry style goes on glow.
         # Drawing that will not glow go on bgrd.
         # bgrd = Image.new(mode="RGBA", size=(annun_width, annun_height), color=self.annun_color)  # annunciator background color, including invert ON modes
-        bgrd = self.get_annunciator_background(width=annun_width, height=annun_height)
+        if self._background is None or self._background.size != (annun_width, annun_height):
+            self._background = self.get_annunciator_background(width=annun_width, height=annun_height)
+        bgrd = self._background.copy()
 
         bgrd_draw = ImageDraw.Draw(bgrd)
-        annun_color = (*self.annun_color, 0) if len(self.annun_color) == 3 else self.annun_color
+        annun_color = self.annun_layer_color
 
-        glow = Image.new(mode="RGBA", size=(annun_width, annun_height), color=annun_color)  # annunciator text and leds , color=(0, 0, 0, 0)
-        draw = ImageDraw.Draw(glow)
-        guard = Image.new(mode="RGBA", size=(ICON_SIZE, ICON_SIZE), color=annun_color)  # annunuciator optional guard
-        guard_draw = ImageDraw.Draw(guard)
+        glow, draw = self.get_glow_layer(width=annun_width, height=annun_height, color=annun_color)  # annunciator text and leds , color=(0, 0, 0, 0)
 
         for part in self.annunciator_parts.values():
             part.render(draw, bgrd_draw, ICON_SIZE, annun_width, annun_height, inside, size)
@@ -585,18 +715,17 @@ class Annunciator(DrawBase):
         # PART 1.2: Glowing texts, later because not nicely perfect.
         if self.annunciator_style == ANNUNCIATOR_STYLES.KORRY:
             # blurred_image = glow.filter(ImageFilter.UnsharpMask(radius=2, percent=200, threshold=10))
-            blurred_image1 = glow.filter(ImageFilter.GaussianBlur(10))  # self.annunciator.get("blurr", 10)
-            blurred_image2 = glow.filter(ImageFilter.GaussianBlur(4))  # self.annunciator.get("blurr", 10)
+            # blurred layers are part of the finished image cached in get_image_for_icon()
+            blurred_images = [glow.filter(blur) for blur in KORRY_GLOW_BLURS]  # self.annunciator.get("blurr", 10)
             # blurred_image = glow.filter(ImageFilter.BLUR)
-            glow.alpha_composite(blurred_image1)
-            glow.alpha_composite(blurred_image2)
+            for blurred_image in blurred_images:
+                glow.alpha_composite(blurred_image)
             # glow = blurred_image
             # logger.debug("blurred")
 
         # PART 1.3: Seal
-        if self.button.has_option("seal"):
-            seal_width = int(self.button._config.get("seal-width", 16))
-            seal_color = self.button._config.get("seal-color", "darkslategray")
+        if self.seal is not None:
+            seal_width, seal_color = self.seal
             sw2 = seal_width / 2
             bgrd_draw.line(
                 [(sw2, sw2), (annun_width - sw2, sw2)],
@@ -621,32 +750,33 @@ class Annunciator(DrawBase):
 
         # PART 2: Make annunciator
         # Paste the transparent text/glow into the annunciator background (and optional seal):
-        annunciator = Image.new(mode="RGBA", size=(annun_width, annun_height), color=annun_color)
-        annunciator.alpha_composite(bgrd)  # potential inverted colors
+        if annun_color[3] == 0:  # base is fully transparent, compositing is a plain copy, bgrd is already a fresh copy
+            annunciator = bgrd  # potential inverted colors
+        else:
+            annunciator = Image.new(mode="RGBA", size=(annun_width, annun_height), color=annun_color)
+            annunciator.alpha_composite(bgrd)  # potential inverted colors
         # annunciator.alpha_composite(glow)    # texts
         annunciator.paste(glow, mask=glow)  # texts
 
         # PART 3: Background
         # Paste the annunciator into the button background:
-        image = self.button.deck.get_icon_background(
-            name=self.button_name(),
-            width=ICON_SIZE,
-            height=ICON_SIZE,
-            texture_in=self.cockpit_texture,
-            color_in=self.cockpit_color,
-            use_texture=True,
-            who="Annunciator",
-        )
-        draw = ImageDraw.Draw(image)
+        if self._icon_background is None:
+            self._icon_background = self.button.deck.get_icon_background(
+                name=self.button_name(),
+                width=ICON_SIZE,
+                height=ICON_SIZE,
+                texture_in=self.cockpit_texture,
+                color_in=self.cockpit_color,
+                use_texture=True,
+                who="Annunciator",
+            )
+        image = self._icon_background.copy()
         image.paste(annunciator, box=(int(width_offset), int(height_offset)))
 
         # PART 4: Guard
         if self.button.has_guard():
-            cover = self.button.guarded.get(CONFIG_KW.ANNUNCIATOR_MODEL.value, GUARD_TYPES.COVER.value)  # CONFIG_KW.ANNUNCIATOR_MODEL.value = "model"
-            guard_color = self.button.guarded.get("color", "red")
-            guard_color = convert_color(guard_color)
-            sw = self.button.guarded.get("grid-width", 16)
-            topp = self.button.guarded.get("top", int(ICON_SIZE / 8))
+            cover, guard_color, sw, topp = self.get_guard_style()
+            guard, guard_draw = self.get_guard_layer(color=annun_color)  # annunuciator optional guard
             tl = (ICON_SIZE / 8, 0)
             br = (int(7 * ICON_SIZE / 8), topp)
             guard_draw.rectangle(tl + br, fill=guard_color)
@@ -704,26 +834,22 @@ class AnnunciatorAnimate(Annunciator):
 
         # Working attributes
         self.running = None  # state unknown
-        self.thread = None
-        self.exit = None
+        self.generation = 0  # incremented at each start, invalidates scheduler entries of previous runs
         self.blink = True
 
-    def loop(self):
-        self.exit = threading.Event()
-        while not self.exit.is_set():
-            self.button.render()
-            self.blink = not self.blink
-            self.all_lit(self.blink)
-            self.exit.wait(self.speed)
-        logger.debug(f"exited")
+    def tick(self):
+        # Called by the animation scheduler every self.speed seconds while running
+        self.button.render()
+        self.blink = not self.blink
+        self.all_lit(self.blink)
 
     def should_run(self) -> bool:
         """
         Check conditions to animate the icon.
         """
         value = self.get_button_value()
-        if type(value) is dict:
-            value = value[list(value.keys())[0]]
+        if isinstance(value, dict):  # one value per part, first part drives the animation
+            value = next(iter(value.values()), None)
         return value is not None and value != 0
 
     def anim_start(self):
@@ -731,9 +857,10 @@ class AnnunciatorAnimate(Annunciator):
         Starts animation
         """
         if not self.running:
-            self.thread = threading.Thread(target=self.loop, name=f"ButtonAnimate::loop({self.button.name})")
-            self.running = True
-            self.thread.start()
+            with ICON_ANIMATION_SCHEDULER.condition:
+                self.running = True
+                self.generation = self.generation + 1
+                ICON_ANIMATION_SCHEDULER.add(self)
         else:
             logger.warning(f"button {self.button.name}: already started")
 
@@ -742,11 +869,8 @@ class AnnunciatorAnimate(Annunciator):
         Stops animation
         """
         if self.running:
-            self.running = False
-            self.exit.set()
-            self.thread.join(timeout=2 * self.speed)
-            if self.thread.is_alive():
-                logger.warning(f"button {self.button.name}: did not get finished signal")
+            with ICON_ANIMATION_SCHEDULER.tick_lock:  # waits for a tick in progress, no tick after
+                self.running = False
             self.all_lit(False)
             if render:
                 return super().render()
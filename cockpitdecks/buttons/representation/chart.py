@@ -5,7 +5,6 @@ import logging
 import threading
 import math
 from random import randint
-import traceback
 
 from PIL import ImageDraw
 
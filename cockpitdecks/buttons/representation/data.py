@@ -2,7 +2,6 @@
 # Buttons that are drawn on render()
 #
 import logging
-import threading
 
 from PIL import Image, ImageDraw
 
@@ -3,8 +3,6 @@
 #
 import logging
 import math
-from random import randint
-from enum import Enum
 
 from PIL import Image, ImageDraw
 
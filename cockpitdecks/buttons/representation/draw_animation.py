@@ -2,10 +2,9 @@
 # Buttons that are drawn on render()
 #
 import logging
-import threading
 
-from .icon import MultiIcons
 from .draw import DrawBase
+from .icon_animation import ICON_ANIMATION_SCHEDULER
 from cockpitdecks import ICON_SIZE
 
 logger = logging.getLogger(__name__)
@@ -41,16 +40,12 @@ class DrawAnimation(DrawBase):
         self.tween = 0
 
         self.running: bool | None = None  # state unknown
-        self.exit = None
-        self.thread = None
+        self.generation = 0  # incremented at each start, invalidates scheduler entries of previous runs
 
-    def loop(self):
-        self.exit = threading.Event()
-        while not self.exit.is_set():
-            self.animate()
-            self.button.render()
-            self.exit.wait(self.speed)
-        logger.debug("exited")
+    def tick(self):
+        # Called by the animation scheduler every self.speed seconds while running
+        self.animate()
+        self.button.render()
 
     def should_run(self) -> bool:
         """
@@ -75,9 +70,10 @@ class DrawAnimation(DrawBase):
         Starts animation
         """
         if not self.running and self.speed is not None:
-            self.running = True
-            self.thread = threading.Thread(target=self.loop, name=f"ButtonAnimate::loop({self.button.name})")
-            self.thread.start()
+            with ICON_ANIMATION_SCHEDULER.condition:
+                self.running = True
+                self.generation = self.generation + 1
+                ICON_ANIMATION_SCHEDULER.add(self)
             logger.debug("started")
         else:
             logger.warning(f"button {self.button.name}: already started")
@@ -87,17 +83,8 @@ class DrawAnimation(DrawBase):
         Stops animation
         """
         if self.running:
-            self.running = False
-            self.exit.set()
-            try:
-                wait = 2 * (self.speed if self.speed is not None else 5)
-                if wait < 5:
-                    wait = 5
-                self.thread.join(timeout=wait)
-                if self.thread.is_alive():
-                    logger.warning(f"button {self.button.name}: animation did not terminate (timetout {wait}secs.)")
-            except:
-                pass
+            with ICON_ANIMATION_SCHEDULER.tick_lock:  # waits for a tick in progress, no tick after
+                self.running = False
             logger.debug("stopped")
         else:
             logger.debug(f"button {self.button.name}: already stopped")
@@ -3,8 +3,6 @@
 #
 import logging
 import math
-from enum import Enum
-import random
 
 from PIL import Image, ImageDraw
 
@@ -3,15 +3,17 @@ All representations for Icon/image based.
 """
 
 import logging
+from functools import lru_cache
 
 from PIL import Image, ImageDraw, ImageFont
 
 from cockpitdecks.resources.color import TRANSPARENT_PNG_COLOR, convert_color, has_ext, add_ext, DEFAULT_COLOR
-from cockpitdecks import CONFIG_KW, DECK_KW, DECK_FEEDBACK, DEFAULT_LABEL_POSITION
+from cockpitdecks import CONFIG_KW, DECK_KW, DECK_FEEDBACK, DEFAULT_LABEL_POSITION, VALID_LABEL_POSITIONS
 from .representation import Representation
 
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
+RENDER_DEBUG = False  # set to True to log per frame rendering details (with debug level above)
 
 
 #
@@ -21,6 +23,78 @@ logger = logging.getLogger(__name__)
 #
 NO_ICON = "no-icon"
 
+# Loaded fonts, keyed by (font file, font size), shared by all buttons
+FONT_CACHE = {}
+
+# Number of finished images (icon with label and marks) kept per icon button
+ICON_IMAGE_CACHE_SIZE = 32
+
+
+def get_truetype_font(fontfile: str, fontsize: int):
+    """
+    Returns the font object for font file and size, parsing the font file only once.
+    """
+    key = (fontfile, fontsize)
+    font = FONT_CACHE.get(key)
+    if font is None:
+        font = ImageFont.truetype(fontfile, fontsize)
+        FONT_CACHE[key] = font
+    return font
+
+
+@lru_cache(maxsize=64)
+def probe_truetype_font(fontfile: str, fontsize: int):
+    """
+    Returns the font object for font file and size, or None if it cannot be loaded.
+    Failed probes are remembered as well.
+    """
+    try:
+        return get_truetype_font(fontfile, fontsize)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=64)
+def get_text_anchor(text_position: str, width: int, height: int, text_size: int) -> tuple:
+    """
+    Returns text position (w, h), horizontal anchor and alignment for a position code like "lt" or "cm".
+    Few combinations are used, they are cached.
+    """
+    inside = round(0.04 * width + 0.5)
+    w = width / 2
+    p = "m"
+    a = "center"
+    if text_position[0] == "l":
+        w = inside
+        p = "l"
+        a = "left"
+    elif text_position[0] == "r":
+        w = width - inside
+        p = "r"
+        a = "right"
+    h = height / 2
+    if text_position[1] == "t":
+        h = inside + text_size / 2
+    elif text_position[1] == "b":
+        h = height - inside - text_size / 2
+    return w, h, p, a
+
+
+@lru_cache(maxsize=16)
+def get_corner_mark(width: int, size: float, fill, outline=None) -> tuple:
+    """
+    Returns a small transparent image with a triangular mark drawn on it
+    and the offset where to paste it in the lower right corner of an icon of width pixels.
+    Marks are drawn once and pasted, with the same pixels as if drawn on the icon.
+    """
+    c = round(0.97 * width)  # % from edge
+    s = round(size * width)  # size
+    mark = Image.new(mode="RGBA", size=(s + 1, s + 1), color=(0, 0, 0, 0))
+    draw = ImageDraw.Draw(mark)
+    pologon = ((s, s), (s, 0), (0, s), (s, s))  # lower right corner, relative to (c - s, c - s)
+    draw.polygon(pologon, fill=fill, outline=outline)
+    return mark, (c - s, c - s)
+
 
 class IconBase(Representation):
     """Abstract icon class
@@ -46,21 +120,18 @@ class IconBase(Representation):
         self.label_color = button.get_attribute("label-color")
         self.label_color = convert_color(self.label_color)
         self.label_position = button.get_attribute("label-position")
-        if self.label_position[0] not in "lcr" or self.label_position[1] not in "tmb":
-            if self.label_position[0] not in "lcr":
-                logger.warning(f"button {self.button_name()}: {type(self).__name__} invalid label horizontal position code {self.label_position[0]}")
-            if self.label_position[1] not in "tmb":
-                logger.warning(f"button {self.button_name()}: {type(self).__name__} invalid label vertical position code {self.label_position[1]}")
-            self.label_position = DEFAULT_LABEL_POSITION
+        if self.label_position not in VALID_LABEL_POSITIONS:
             logger.warning(
-                f"button {self.button_name()}: {type(self).__name__} invalid label position code {self.label_position}, using default ({self.label_position})"
+                f"button {self.button_name()}: {self._NAME} invalid label position code {self.label_position}, using default ({DEFAULT_LABEL_POSITION})"
             )
+            self.label_position = DEFAULT_LABEL_POSITION
 
         self.cockpit_color = button.get_attribute("cockpit-color")
         self.cockpit_color = convert_color(self.cockpit_color)
         self.cockpit_texture = button.get_attribute("cockpit-texture")
 
         self._icon_cache = None
+        self._fonts = {}  # (font name, font size): font, resolved fonts
 
     def is_valid(self):
         return super().is_valid()
@@ -70,24 +141,35 @@ class IconBase(Representation):
 
     def get_font(self, fontname: str, fontsize: int):
         """
-        Helper function to get valid font, depending on button or global preferences
+        Helper function to get valid font, depending on button or global preferences.
+        Font resolution does not change for a button, result is memoized.
+        """
+        key = (fontname, fontsize)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self.find_font(fontname, fontsize)
+            self._fonts[key] = font
+        return font
+
+    def find_font(self, fontname: str, fontsize: int):
+        """
+        Finds a valid font, depending on button or global preferences
         """
         deck = self.button.deck
         cockpit = deck.cockpit
         all_fonts = cockpit.fonts
-        fonts_available = list(all_fonts.keys())
-        this_button = f"{self.button_name()}: {type(self).__name__}"
+        this_button = f"{self.button_name()}: {self._NAME}"
 
         def try_ext(fn):
             if fn is not None:
                 if has_ext(fn, ".ttf") or has_ext(fn, ".otf"):
-                    if fn in fonts_available:
+                    if fn in all_fonts:
                         return all_fonts[fn]
                 f1 = add_ext(fn, ".ttf")
-                if f1 in fonts_available:
+                if f1 in all_fonts:
                     return all_fonts[f1]
                 f2 = add_ext(fn, ".otf")
-                if f2 in fonts_available:
+                if f2 in all_fonts:
                     return all_fonts[f2]
                 logger.warning(f"button {this_button}: font '{fn}' not found")
             return None
@@ -95,26 +177,26 @@ class IconBase(Representation):
         # 1. Tries button specific font
         f = try_ext(fontname)
         if f is not None:
-            return ImageFont.truetype(f, fontsize)
+            return get_truetype_font(f, fontsize)
 
         # 2. Tries default fonts
         default_font = self.button.get_attribute("label-font")
         if default_font is not None:
             f = try_ext(default_font)
             if f is not None:
-                return ImageFont.truetype(f, fontsize)
+                return get_truetype_font(f, fontsize)
 
         # 3. Returns first font, if any
-        if len(fonts_available) > 0:
-            f = all_fonts[fonts_available[0]]
-            logger.warning(f"button {this_button} cockpit default label font not found in {fonts_available}. Returning first font found ({f})")
-            return ImageFont.truetype(f, fontsize)
+        if len(all_fonts) > 0:
+            f = next(iter(all_fonts.values()))
+            logger.warning(f"button {this_button} cockpit default label font not found in {list(all_fonts)}. Returning first font found ({f})")
+            return get_truetype_font(f, fontsize)
 
         # 5. Tries cockpit default font
         default_font = cockpit.default_font
         f = try_ext(default_font)
         if f is not None:
-            return ImageFont.truetype(f, fontsize)
+            return get_truetype_font(f, fontsize)
 
         logger.error("no font, using pillow default")
         return ImageFont.load_default()
@@ -131,17 +213,29 @@ class IconBase(Representation):
         image = self.get_image_for_icon()
 
         if image is None:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__} no image")
+            logger.warning(f"button {self.button_name()}: {self._NAME} no image")
             return None
 
-        if self.button.has_option("placeholder"):
+        image, copied = self.mark_image(
+            image,
+            placeholder=self.button.has_option("placeholder"),
+            valid=self.is_valid(),
+            activation_valid=self.button._activation is None or self.button._activation.is_valid(),
+        )
+        return self.overlay_text(image, "label", self._config, copy_image=not copied)
+
+    def mark_image(self, image, placeholder: bool, valid: bool, activation_valid: bool):
+        """
+        Adds a little marker on placeholder/invalid buttons that will do nothing.
+        Returns the image and whether it is a copy. Image is copied at most once, only if a mark is added.
+        """
+        if not placeholder and valid and activation_valid:
+            return image, False
+
+        image = image.copy()  # we will add marks (and text) over it
+        if placeholder:
             # Add little blue check mark if placeholder
-            image = image.copy()  # we will add text over it
-            draw = ImageDraw.Draw(image)
-            c = round(0.97 * image.width)  # % from edge
-            s = round(0.10 * image.width)  # size
-            pologon = ((c, c), (c, c - s), (c - s, c), (c, c))  # lower right corner
-            draw.polygon(pologon, fill="deepskyblue")
+            self.paste_mark(image, 0.10, "deepskyblue")
         else:
             # Button is invalid, add a little red mark
             # if not self.button.is_valid():
@@ -153,22 +247,12 @@ class IconBase(Representation):
             #     draw.polygon(pologon, fill="red", outline="white")
 
             # Representation is invalid, add a little orange mark
-            if not self.is_valid():
-                image = image.copy()  # we will add text over it
-                draw = ImageDraw.Draw(image)
-                c = round(0.97 * image.width)  # % from edge
-                s = round(0.15 * image.width)  # size
-                pologon = ((c, c), (c, c - s), (c - s, c), (c, c))  # lower right corner
-                draw.polygon(pologon, fill="orange")
+            if not valid:
+                self.paste_mark(image, 0.15, "orange")
 
             # Activation is invalid, add a little red mark (may be on top of above mark...)
-            if self.button._activation is not None and not self.button._activation.is_valid():
-                image = image.copy()  # we will add text over it
-                draw = ImageDraw.Draw(image)
-                c = round(0.97 * image.width)  # % from edge
-                s = round(0.08 * image.width)  # size
-                pologon = ((c, c), (c, c - s), (c - s, c), (c, c))  # lower right corner
-                draw.polygon(pologon, fill="red", outline="white")
+            if not activation_valid:
+                self.paste_mark(image, 0.08, "red", "white")
 
         # Add little check mark if not valid/fake
         # if self.button._config.get("type", "none") == "none":
@@ -178,21 +262,28 @@ class IconBase(Representation):
         #     s = round(0.1 * image.width)   # size
         #     pologon = ( (c1, image.height-c1), (c1, image.height-c1-s), (c1+s, image.height-c1), ((c1, image.height-c1)) )  # lower left corner
         #     draw.polygon(pologon, fill="orange", outline="white")
+        return image, True
 
-        return self.overlay_text(image, "label", self._config)
+    def paste_mark(self, image, size: float, fill, outline=None):
+        # Pastes the pre-drawn triangular mark in the lower right corner
+        mark, offset = get_corner_mark(image.width, size, fill, outline)
+        image.paste(mark, offset, mark)
 
-    def overlay_text(self, image, which_text, text_dict):
+    def overlay_text(self, image, which_text, text_dict, text_detail: tuple | None = None, copy_image: bool = True):
         draw = None
         # Add label if any
 
-        text, text_format, text_font, text_color, text_size, text_position = self.get_text_detail(text_dict, which_text)
+        if text_detail is None:  # caller may already have it
+            text_detail = self.get_text_detail(text_dict, which_text)
+        text, text_format, text_font, text_color, text_size, text_position = text_detail
 
-        logger.debug(f"button {self.button_name()}: text is from {which_text}: {text}")
+        if RENDER_DEBUG:  # called at each rendering
+            logger.debug(f"button {self.button_name()}: text is from {which_text}: {text}")
 
         if which_text == "label":
             text_size = int(text_size * image.width / 72)
 
-        if text is None:
+        if text is None or text.strip() == "":  # nothing to draw, no need to copy
             return image
 
         if self.button.is_managed() and which_text == CONFIG_KW.TEXT.value:
@@ -201,27 +292,15 @@ class IconBase(Representation):
                 text_font = "AirbusFCU"  # hardcoded
 
         font = self.get_font(text_font, text_size)
-        image = image.copy()  # we will add text over it
+        if copy_image:  # caller may already have made a copy
+            image = image.copy()  # we will add text over it
         draw = ImageDraw.Draw(image)
-        inside = round(0.04 * image.width + 0.5)
-        w = image.width / 2
-        p = "m"
-        a = "center"
-        if text_position[0] == "l":
-            w = inside
-            p = "l"
-            a = "left"
-        elif text_position[0] == "r":
-            w = image.width - inside
-            p = "r"
-            a = "right"
-        h = image.height / 2
-        if text_position[1] == "t":
-            h = inside + text_size / 2
-        elif text_position[1] == "b":
-            h = image.height - inside - text_size / 2
+        w, h, p, a = get_text_anchor(text_position, image.width, image.height, text_size)
         # logger.debug(f"position {(w, h)}")
-        draw.multiline_text((w, h), text=text, font=font, anchor=p + "m", align=a, fill=text_color)  # (image.width / 2, 15)
+        if "\n" in text:
+            draw.multiline_text((w, h), text=text, font=font, anchor=p + "m", align=a, fill=text_color)  # (image.width / 2, 15)
+        else:  # single line, same placement without multiline layout (line splitting and width measurements)
+            draw.text((w, h), text=text, font=font, anchor=p + "m", fill=text_color)
         return image
 
     def clean(self):
@@ -260,6 +339,8 @@ class Icon(IconBase):
                 logger.debug(f"button {self.button_name()}: requested to no do icon")
 
         self._icon_cache = None
+        self._image_cache = {}  # (icon, label details, marks): finished image
+        self._image_cache_size = ICON_IMAGE_CACHE_SIZE
 
     def is_valid(self):
         if super().is_valid():  # so there is a button...
@@ -267,7 +348,7 @@ class Icon(IconBase):
                 return True
             if self.cockpit_color is not None:
                 return True
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: no icon and no icon color")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: no icon and no icon color")
         return False
 
     def get_image_for_icon(self):
@@ -276,15 +357,33 @@ class Icon(IconBase):
         if image is None:
             image = self.button.deck.create_icon_for_key(index=self.button.index, colors=self.cockpit_color, texture=self.cockpit_texture)
         else:
+            if image.mode != "RGBA":  # convert once, keep converted image for next renders
+                image = image.convert("RGBA")
+                deck.cockpit.icons[self.icon] = image
             image = deck.scale_icon_for_key(self.button.index, image, name=self.icon)  # this will cache it in the deck as well
         return image
 
+    def clean_cache(self):
+        super().clean_cache()
+        self._image_cache = {}
+
     def get_image(self):
         """
         Helper function to get button image and overlay label on top of it.
         Label may be updated at each activation since it can contain datarefs.
         Also add a little marker on placeholder/invalid buttons that will do nothing.
+        Finished images are cached since the same few icon/label combinations are rendered over and over.
+        The returned image is the cached one, it is read-only: callers that need to modify it must work on a copy.
         """
+        label = self.get_text_detail(self._config, "label")
+        placeholder = self.button.has_option("placeholder")
+        valid = self.is_valid()
+        activation_valid = self.button._activation is None or self.button._activation.is_valid()
+        key = (self.icon, label, placeholder, valid, activation_valid)
+        image = self._image_cache.get(key)
+        if image is not None:
+            return image
+
         image = None
         if self.frame is not None:
             image = self.get_framed_icon()
@@ -292,55 +391,16 @@ class Icon(IconBase):
             image = self.get_image_for_icon()
 
         if image is None:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__} no image")
+            logger.warning(f"button {self.button_name()}: {self._NAME} no image")
             return None
 
-        if self.button.has_option("placeholder"):
-            # Add little blue check mark if placeholder
-            image = image.copy()  # we will add text over it
-            draw = ImageDraw.Draw(image)
-            c = round(0.97 * image.width)  # % from edge
-            s = round(0.10 * image.width)  # size
-            pologon = ((c, c), (c, c - s), (c - s, c), (c, c))  # lower right corner
-            draw.polygon(pologon, fill="deepskyblue")
-        else:
-            # Button is invalid, add a little red mark
-            # if not self.button.is_valid():
-            #     image = image.copy()  # we will add text over it
-            #     draw = ImageDraw.Draw(image)
-            #     c = round(0.97 * image.width)  # % from edge
-            #     s = round(0.10 * image.width)  # size
-            #     pologon = ( (c, c), (c, c-s), (c-s, c), (c, c) )  # lower right corner
-            #     draw.polygon(pologon, fill="red", outline="white")
-
-            # Representation is invalid, add a little orange mark
-            if not self.is_valid():
-                image = image.copy()  # we will add text over it
-                draw = ImageDraw.Draw(image)
-                c = round(0.97 * image.width)  # % from edge
-                s = round(0.15 * image.width)  # size
-                pologon = ((c, c), (c, c - s), (c - s, c), (c, c))  # lower right corner
-                draw.polygon(pologon, fill="orange")
+        image, copied = self.mark_image(image, placeholder=placeholder, valid=valid, activation_valid=activation_valid)
 
-            # Activation is invalid, add a little red mark (may be on top of above mark...)
-            if self.button._activation is not None and not self.button._activation.is_valid():
-                image = image.copy()  # we will add text over it
-                draw = ImageDraw.Draw(image)
-                c = round(0.97 * image.width)  # % from edge
-                s = round(0.08 * image.width)  # size
-                pologon = ((c, c), (c, c - s), (c - s, c), (c, c))  # lower right corner
-                draw.polygon(pologon, fill="red", outline="white")
-
-        # Add little check mark if not valid/fake
-        # if self.button._config.get("type", "none") == "none":
-        #     image = image.copy()  # we will add text over it
-        #     draw = ImageDraw.Draw(image)
-        #     c1 = round(0.03 * image.width)  # % from edge
-        #     s = round(0.1 * image.width)   # size
-        #     pologon = ( (c1, image.height-c1), (c1, image.height-c1-s), (c1+s, image.height-c1), ((c1, image.height-c1)) )  # lower left corner
-        #     draw.polygon(pologon, fill="orange", outline="white")
-
-        return self.overlay_text(image, "label", self._config)
+        image = self.overlay_text(image, "label", self._config, text_detail=label, copy_image=not copied)
+        if len(self._image_cache) >= self._image_cache_size:
+            del self._image_cache[next(iter(self._image_cache))]  # oldest
+        self._image_cache[key] = image
+        return image
 
     def get_framed_icon(self):
         # We assume self.frame is a non null dict
@@ -349,7 +409,7 @@ class Icon(IconBase):
         frame_content = self.frame.get("content-size")
         frame_position = self.frame.get("content-offset")
 
-        this_button = f"{self.button_name()}: {type(self).__name__}"
+        this_button = f"{self.button_name()}: {self._NAME}"
         image = None
         deck = self.button.deck
         if frame is None or frame_size is None or frame_position is None or frame_content is None:
@@ -372,7 +432,8 @@ class Icon(IconBase):
                 90,
                 125,
             )  # frame_position + (frame_position[0]+frame_content[0],frame_position[1]+frame_content[1])
-            logger.debug(f"button {this_button}: {self.icon}, {frame}, {image}, {inside}, {box}")
+            if RENDER_DEBUG:
+                logger.debug(f"button {this_button}: {self.icon}, {frame}, {image}, {inside}, {box}")
             image.paste(inside, box)
             image = deck.scale_icon_for_key(self.button.index, image)
             return image
@@ -517,10 +578,10 @@ class MultiTexts(IconText):
 
     def is_valid(self):
         if self.multi_texts is None:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: no icon")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: no icon")
             return False
         if len(self.multi_texts) == 0:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: no icon")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: no icon")
         return super().is_valid()
 
     def num_texts(self):
@@ -529,12 +590,12 @@ class MultiTexts(IconText):
     def render(self):
         value = self.get_button_value()
         if value is None:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: no current value, no rendering")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: no current value, no rendering")
             return None
         if type(value) in [str, int, float]:
             value = int(value)
         else:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: complex value {value}")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: complex value {value}")
             return None
         if self.num_texts() > 0:
             if value >= 0 and value < self.num_texts():
@@ -543,7 +604,7 @@ class MultiTexts(IconText):
                 self.text_config = self.multi_texts[value % self.num_texts()]
             return super().render()
         else:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: icon not found {value}/{self.num_texts()}")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: icon not found {value}/{self.num_texts()}")
         return None
 
     def describe(self) -> str:
@@ -565,7 +626,7 @@ class MultiIcons(Icon):
         if len(self.multi_icons) == 0:
             self.multi_icons = self._config.get("multi-icons", [])
         else:
-            logger.debug(f"button {self.button_name()}: {type(self).__name__}: animation sequence {len(self.multi_icons)}")
+            logger.debug(f"button {self.button_name()}: {self._NAME}: animation sequence {len(self.multi_icons)}")
 
         if len(self.multi_icons) > 0:
             invalid = []
@@ -574,16 +635,19 @@ class MultiIcons(Icon):
                 if icon is not None:
                     self.multi_icons[i] = icon
                 else:
-                    logger.warning(f"button {self.button_name()}: {type(self).__name__}: icon not found {self.multi_icons[i]}")
+                    logger.warning(f"button {self.button_name()}: {self._NAME}: icon not found {self.multi_icons[i]}")
                     invalid.append(i)
             for i in invalid:
                 del self.multi_icons[i]
         else:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: no icon")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: no icon")
+
+        # Keep all icons (and an optional off icon) rendered
+        self._image_cache_size = max(ICON_IMAGE_CACHE_SIZE, len(self.multi_icons) + 1)
 
     def is_valid(self):
         if self.multi_icons is None or len(self.multi_icons) == 0:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: no icon")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: no icon")
             return False
         return super().is_valid()
 
@@ -593,21 +657,19 @@ class MultiIcons(Icon):
     def render(self):
         value = self.get_button_value()
         if value is None:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: no current value, no rendering")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: no current value, no rendering")
             return None
         if type(value) in [str, int, float]:
             value = int(value)
         else:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: complex value {value}")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: complex value {value}")
             return None
-        if self.num_icons() > 0:
-            if value >= 0 and value < self.num_icons():
-                self.icon = self.multi_icons[value]
-            else:
-                self.icon = self.multi_icons[value % self.num_icons()]
+        num_icons = self.num_icons()
+        if num_icons > 0:
+            self.icon = self.multi_icons[value % num_icons]  # also valid for value in range
             return super().render()
         else:
-            logger.warning(f"button {self.button_name()}: {type(self).__name__}: icon not found {value}/{self.num_icons()}")
+            logger.warning(f"button {self.button_name()}: {self._NAME}: icon not found {value}/{num_icons}")
         return None
 
     def describe(self) -> str:
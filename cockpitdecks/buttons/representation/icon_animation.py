@@ -3,15 +3,79 @@
 #
 import logging
 import threading
+import heapq
+import itertools
+import time
 
 from .icon import MultiIcons
-from .draw import DrawBase
-from cockpitdecks import ICON_SIZE
 
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
 
 
+class IconAnimationScheduler:
+    """
+    Single thread that drives all running animations (icon animations, blinking annunciators, drawn animations).
+    An animation has running, generation and speed attributes, and a tick() method.
+    Animations are kept in a heap ordered by their next tick.
+    The thread is started when an animation is added and ends when no animation is left.
+    The condition only protects the heap, ticks are run outside of it, holding tick_lock instead.
+    Stopping an animation is done holding tick_lock, so an animation stopped from another thread
+    never gets ticked afterwards, adding or starting animations never waits for a tick.
+    An animation that fails to tick is stopped, others keep running.
+    """
+
+    def __init__(self):
+        self.queue = []  # heap of (next tick, sequence, generation, animation)
+        self.sequence = itertools.count()  # tie breaker, animations are not comparable
+        self.condition = threading.Condition()
+        self.tick_lock = threading.RLock()  # re-entrant, a tick renders, rendering may stop the animation
+        self.thread: threading.Thread | None = None
+
+    def add(self, animation):
+        with self.condition:
+            heapq.heappush(self.queue, (time.monotonic(), next(self.sequence), animation.generation, animation))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.loop, name="IconAnimation::scheduler", daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def loop(self):
+        try:
+            while True:
+                with self.condition:
+                    if len(self.queue) == 0:
+                        break
+                    next_tick, _, generation, animation = self.queue[0]
+                    delay = next_tick - time.monotonic()
+                    if delay > 0:
+                        self.condition.wait(timeout=delay)
+                        continue
+                    heapq.heappop(self.queue)
+                with self.tick_lock:
+                    if not animation.running or generation != animation.generation:
+                        continue  # stopped, or stopped and restarted with a new entry
+                    try:
+                        animation.tick()
+                    except:
+                        logger.warning(f"animation {type(animation).__name__} failed, stopped", exc_info=True)
+                        animation.running = False  # can be started again
+                        continue
+                with self.condition:
+                    heapq.heappush(self.queue, (max(next_tick + animation.speed, time.monotonic()), next(self.sequence), generation, animation))
+        finally:
+            with self.condition:
+                if self.thread is threading.current_thread():  # add() may already have started a new one
+                    self.thread = None
+                if len(self.queue) > 0:  # exited on error with animations left, restart
+                    self.thread = threading.Thread(target=self.loop, name="IconAnimation::scheduler", daemon=True)
+                    self.thread.start()
+        logger.debug("no more animation, exited")
+
+
+ICON_ANIMATION_SCHEDULER = IconAnimationScheduler()
+
+
 #
 # ###############################
 # ANIMATED  REPRESENTATION
@@ -43,17 +107,13 @@ class IconAnimation(MultiIcons):
         # Internal variables
         self.counter = 0
         self.running = False
-        self.exit: threading.Event | None = None
-        self.thread: threading.Thread | None = None
+        self.generation = 0  # incremented at each start, invalidates scheduler entries of previous runs
 
-    def loop(self):
-        self.exit = threading.Event()
-        while not self.exit.is_set():
-            self.button.render()
-            self.counter = self.counter + 1
-            self.button.value = self.counter  # get_current_value() will fetch self.counter value
-            self.exit.wait(self.speed)
-        logger.debug(f"exited")
+    def tick(self):
+        # Called by the scheduler every self.speed seconds while running
+        self.button.render()
+        self.counter = self.counter + 1
+        self.button.value = self.counter  # get_current_value() will fetch self.counter value
 
     def should_run(self) -> bool:
         """
@@ -67,9 +127,10 @@ class IconAnimation(MultiIcons):
         Starts animation
         """
         if not self.running:
-            self.running = True
-            self.thread = threading.Thread(target=self.loop, name=f"ButtonAnimate::loop({self.button_name()})")
-            self.thread.start()
+            with ICON_ANIMATION_SCHEDULER.condition:
+                self.running = True
+                self.generation = self.generation + 1
+                ICON_ANIMATION_SCHEDULER.add(self)
         else:
             logger.warning(f"button {self.button_name()}: already started")
 
@@ -77,12 +138,9 @@ class IconAnimation(MultiIcons):
         """
         Stops animation
         """
-        if self.running and self.exit is not None and self.thread is not None:
-            self.running = False
-            self.exit.set()
-            self.thread.join(timeout=2 * self.speed)
-            if self.thread.is_alive():
-                logger.warning(f"..thread may hang..")
+        if self.running:
+            with ICON_ANIMATION_SCHEDULER.tick_lock:  # waits for a tick in progress, no tick after
+                self.running = False
             if render:
                 self.render()
         else:
@@ -105,7 +163,7 @@ class IconAnimation(MultiIcons):
             self.icon = self.multi_icons[(self.counter % len(self.multi_icons))]
             if not self.running:
                 self.anim_start()
-            return super().render()
+            return super(MultiIcons, self).render()  # icon already selected, no need to fetch value again
         if self.running:
             self.anim_stop()
         self.icon = self.icon_off
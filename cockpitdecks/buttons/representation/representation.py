@@ -25,6 +25,12 @@ class Representation:
 
     PARAMETERS = {}
 
+    _NAME = "Representation"  # class name, set once per subclass, used in log messages
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._NAME = cls.__name__
+
     @classmethod
     def parameters(cls) -> dict:
         return cls.PARAMETERS
@@ -77,7 +83,7 @@ class Representation:
         return True
 
     def get_id(self):
-        return ID_SEP.join([self.button.get_id(), type(self).__name__])
+        return ID_SEP.join([self.button.get_id(), self._NAME])
 
     def inc(self, name: str, amount: float = 1.0, cascade: bool = True):
         self.button.sim.inc_internal_variable(name=ID_SEP.join([self.get_id(), name]), amount=amount, cascade=cascade)
@@ -93,7 +99,8 @@ class Representation:
         value = self._representation_config.get(attribute)
         if value is not None:  # found!
             if silence:
-                logger.debug(f"button {self.button_name()} representation returning {attribute}={value}")
+                if logger.isEnabledFor(logging.DEBUG):  # called at each rendering
+                    logger.debug(f"button {self.button_name()} representation returning {attribute}={value}")
             else:
                 logger.info(f"button {self.button_name()} representation returning {attribute}={value}")
             return self.button.deck.cockpit.convert_if_color_attribute(attribute=attribute, value=value, silence=silence)
@@ -115,12 +122,12 @@ class Representation:
         return self.button.get_text_detail(config, which_text)
 
     def inspect(self, what: str | None = None):
-        logger.info(f"{type(self).__name__}:")
+        logger.info(f"{self._NAME}:")
         logger.info(f"{self.is_valid()}")
 
     def is_valid(self):
         if self.button is None:
-            logger.warning(f"representation {type(self).__name__} has no button")
+            logger.warning(f"representation {self._NAME} has no button")
             return False
         return True
 
@@ -156,7 +163,7 @@ class Representation:
         return self.button._value.get_rescaled_value(range_min=range_min, range_max=range_max, steps=steps)
 
     def get_status(self):
-        return {"representation_type": type(self).__name__, "sound": self._vibrate}
+        return {"representation_type": self._NAME, "sound": self._vibrate}
 
     def render(self):
         """
@@ -165,7 +172,7 @@ class Representation:
         it to the deck's render() function which takes appropriate action
         to pass the returned value to the appropriate device function for display.
         """
-        logger.debug(f"button {self.button_name()}: {type(self).__name__} has no rendering")
+        logger.debug(f"button {self.button_name()}: {self._NAME} has no rendering")
         return None
 
     def vibrate(self):
@@ -17,10 +17,10 @@ import pkgutil
 
 from typing import Dict, Tuple
 from datetime import datetime
-from queue import Queue
+from queue import SimpleQueue, Empty
+from concurrent.futures import ThreadPoolExecutor
 
-from PIL import Image, ImageFont
-from cairosvg import svg2png
+from PIL import Image
 
 from cockpitdecks.aircraft import Aircraft
 from usbmonitor import USBMonitor
@@ -69,7 +69,7 @@ from cockpitdecks import (
     Config,
     yaml,
 )
-from cockpitdecks.constant import TYPES_FOLDER
+from cockpitdecks.constant import TYPES_FOLDER, ICON_CACHE_FILE, ICON_RAW_MODES
 from cockpitdecks.resources.color import convert_color, has_ext, add_ext
 from cockpitdecks.resources.intvariables import INTERNAL_DATAREF
 from cockpitdecks.variable import Variable, VariableFactory, InternalVariable
@@ -88,6 +88,7 @@ from cockpitdecks.deck import Deck
 from cockpitdecks.decks.resources import DeckType
 from cockpitdecks.buttons.activation import Activation
 from cockpitdecks.buttons.representation import Representation, HardwareRepresentation
+from cockpitdecks.buttons.representation.icon import probe_truetype_font
 
 from cockpitdecks.aircraft import Aircraft
 
@@ -309,6 +310,43 @@ AIRCRAF_CHANGE_SIMULATOR_DATA = {CONFIG_KW.STRING_PREFIX.value + AIRCRAFT_CHANGE
 PERMANENT_SIMULATOR_DATA = AIRCRAF_CHANGE_SIMULATOR_DATA
 
 
+class IconDict(dict):
+    """Icons by name. Values are kept as file path or raw cached pixel data (mode, size, bytes)
+    until the icon is first requested, then the decoded Image replaces them.
+    """
+
+    @staticmethod
+    def decode(value):
+        if isinstance(value, str):
+            image = Image.open(value)
+            image.load()  # decode now, do not keep the file open
+            return image
+        if isinstance(value, tuple):
+            return Image.frombytes(*value)
+        return value
+
+    @staticmethod
+    def raw(value) -> tuple:
+        # (mode, size, bytes) of an icon, for the cache
+        image = IconDict.decode(value)
+        if image.mode not in ICON_RAW_MODES:  # palette, etc. would not survive tobytes()
+            image = image.convert("RGBA")
+        return (image.mode, image.size, image.tobytes())
+
+    def __getitem__(self, name):
+        value = dict.__getitem__(self, name)
+        if isinstance(value, Image.Image):
+            return value
+        image = IconDict.decode(value)
+        self[name] = image
+        return image
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+
 class CockpitBase:
     """As used in Simulator"""
 
@@ -395,6 +433,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
 
         self.usb_monitor = USBMonitor()
         self.devices = []
+        self._devices_by_serial = {}  # serial numbers are read once at scan time
         self._device_scanned = False
 
         self.vd_ws_conn = {}
@@ -413,13 +452,14 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         # these are _cd_ (permanent) | _ac_ (changing)
         self.fonts = {}
         self.sounds = {}
-        self.icons = {}
+        self.icons = IconDict()
         self.observables = {}
 
         # Main event look
         self.event_loop_run = False
         self.event_loop_thread = None
-        self.event_queue = Queue()
+        self.event_queue = SimpleQueue()
+        self.terminated = threading.Event()  # set when cockpit is terminated, run() waits for it
 
         # Simulator
         self._simulator_name = environ.get(ENVIRON_KW.SIMULATOR_NAME.value)
@@ -470,7 +510,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         self.all_activations = {s.name(): s for s in Cockpit.all_subclasses(Activation)} | {DECK_ACTIONS.NONE.value: Activation}
         logger.debug(f"available activations: {", ".join(sorted(self.all_activations.keys()))}")
 
-        self.all_representations = {s.name(): s for s in Cockpit.all_subclasses(Representation)} | {DECK_FEEDBACK.NONE.value: Representation}
+        self.all_representations = {sys.intern(s.name()): s for s in Cockpit.all_subclasses(Representation)} | {DECK_FEEDBACK.NONE.value: Representation}
         logger.debug(f"available representations: {", ".join(sorted(self.all_representations.keys()))}")
 
         self.all_hardware_representations = {s.name(): s for s in Cockpit.all_subclasses(HardwareRepresentation)}
@@ -865,28 +905,32 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
             logger.info("..previous devices terminated")
 
         self.devices = []
+        self._devices_by_serial = {}
         for deck_driver, builder in self.all_deck_drivers.items():
             if deck_driver == VIRTUAL_DECK_DRIVER:
                 # will be added later, when we have acpath set, in add virtual_decks()
                 continue
             decks = builder[1]().enumerate()
             logger.info(f"found {len(decks)} {deck_driver}")
-            for name, device in enumerate(decks):
+            cnt = 0
+            for device in decks:
                 device.open()
                 serial = device.get_serial_number()
                 device.close()
                 if serial in EXCLUDE_DECKS:
                     logger.warning(f"deck {serial} excluded")
-                    del decks[name]
-                logger.debug(f"added {type(device).__name__} (driver {deck_driver}, serial {serial[:3]}{'*'*max(1,len(serial))})")
-                self.devices.append(
-                    {
-                        CONFIG_KW.DRIVER.value: deck_driver,
-                        CONFIG_KW.DEVICE.value: device,
-                        CONFIG_KW.SERIAL.value: serial,
-                    }
-                )
-            logger.debug(f"using {len(decks)} {deck_driver}")
+                    continue
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"added {type(device).__name__} (driver {deck_driver}, serial {serial[:3]}{'*'*max(1,len(serial))})")
+                entry = {
+                    CONFIG_KW.DRIVER.value: deck_driver,
+                    CONFIG_KW.DEVICE.value: device,
+                    CONFIG_KW.SERIAL.value: serial,
+                }
+                self.devices.append(entry)
+                self._devices_by_serial[serial] = entry
+                cnt = cnt + 1
+            logger.debug(f"using {cnt} {deck_driver}")
         self._device_scanned = True
 
         logger.debug(f"..scanned")
@@ -923,12 +967,12 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
                     logger.warning(f"driver: {req_driver}, decks with no serial: {[d[CONFIG_KW.DEVICE.value].name for d in deckdr]}")
             return None
         ## Got serial, search for it
-        for deck in self.devices:
-            if deck[CONFIG_KW.SERIAL.value] == req_serial:
-                device = deck[CONFIG_KW.DEVICE.value]
-                device.open()
-                device.reset()
-                return device
+        deck = self._devices_by_serial.get(req_serial)
+        if deck is not None:
+            device = deck[CONFIG_KW.DEVICE.value]
+            device.open()
+            device.reset()
+            return device
         logger.warning(f"deck {req_serial} not found")
         return None
 
@@ -981,6 +1025,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
                 logger.warning("no device")
                 return
 
+            self.load_aircraft_config()  # before resources, they may use aircraft attributes
             self.load_ac_resources()
             self.create_decks()
             self.load_pages()
@@ -1014,50 +1059,57 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         for name, deck in self.cockpit.items():
             deck.reload_page()
 
+    def locate_font(self, fontname: str) -> str | None:
+        """Returns the font file to use for fontname, None if not found"""
+        if fontname in self.fonts:
+            logger.debug(f"font {fontname} already loaded")
+            return fontname
+
+        # 1. Try "system" font
+        if probe_truetype_font(fontname, self.get_attribute("label-size", DEFAULT_LABEL_SIZE)) is not None:
+            logger.debug(f"font {fontname} found in computer system fonts")
+            return fontname
+        logger.debug(f"font {fontname} not found in computer system fonts")
+
+        # 2. Try font in resources folder
+        fn = os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, fontname)
+        if os.path.isfile(fn):
+            logger.debug(f"font {fontname} found locally ({RESOURCES_FOLDER} folder)")
+            return fn
+        logger.debug(f"font {fontname} not found locally ({RESOURCES_FOLDER} folder)")
+
+        # 3. Try font in resources/fonts folder
+        fn = os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, FONTS_FOLDER, fontname)
+        if os.path.isfile(fn):
+            logger.debug(f"font {fontname} found locally ({FONTS_FOLDER} folder)")
+            return fn
+        logger.debug(f"font {fontname} not found locally ({FONTS_FOLDER} folder)")
+
+        logger.debug(f"font {fontname} not found")
+        return None
+
+    def add_default_font(self, fontname: str, kind: str) -> bool:
+        """Locates and adds a default font to cockpitdecks fonts, returns True if it was added"""
+        if fontname in self._cd_fonts:
+            logger.debug(f"default {kind} font is {fontname}")
+            return False
+        f = self.locate_font(fontname)
+        if f is None:
+            return False
+        self._cd_fonts[fontname] = f
+        logger.info(f"added default {kind} font {fontname}")
+        return True
+
     def load_defaults(self):
         """
         Loads default values for font, icon, etc. They will be used if no layout is found.
         """
 
-        def locate_font(fontname: str) -> str | None:
-            if fontname in self.fonts.keys():
-                logger.debug(f"font {fontname} already loaded")
-                return fontname
-
-            # 1. Try "system" font
-            try:
-                test = ImageFont.truetype(fontname, self.get_attribute("label-size", DEFAULT_LABEL_SIZE))
-                logger.debug(f"font {fontname} found in computer system fonts")
-                return fontname
-            except:
-                logger.debug(f"font {fontname} not found in computer system fonts")
-
-            # 2. Try font in resources folder
-            fn = None
-            try:
-                fn = os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, fontname)
-                test = ImageFont.truetype(fn, self.get_attribute("label-size", DEFAULT_LABEL_SIZE))
-                logger.debug(f"font {fontname} found locally ({RESOURCES_FOLDER} folder)")
-                return fn
-            except:
-                logger.debug(f"font {fontname} not found locally ({RESOURCES_FOLDER} folder)")
-
-            # 3. Try font in resources/fonts folder
-            fn = None
-            try:
-                fn = os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, FONTS_FOLDER, fontname)
-                test = ImageFont.truetype(fn, self.get_attribute("label-size", DEFAULT_LABEL_SIZE))
-                logger.debug(f"font {fontname} found locally ({FONTS_FOLDER} folder)")
-                return fn
-            except:
-                logger.debug(f"font {fontname} not found locally ({FONTS_FOLDER} folder)")
-
-            logger.debug(f"font {fontname} not found")
-            return None
-
         # Load global defaults from resources/config.yaml file or use application default
+        # All top-level keys are used (see get_attribute()), so the whole file is needed,
+        # its parsed content is saved next to it to skip parsing on next start.
         fn = os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, CONFIG_FILE)
-        self._resources_config = Config(fn)
+        self._resources_config = Config(fn, cache=True, cache_file=self.get_attribute("cache-config"))
         if not self._resources_config.is_valid():
             logger.error(f"configuration file {fn} is not valid")
 
@@ -1071,7 +1123,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         # XXX
         # Check availability of expected default fonts
         dftname = self.get_attribute("icon-name")
-        if dftname in self.icons.keys():
+        if dftname in self.icons:
             logger.debug(f"default icon name {dftname} found")
         else:
             logger.warning(f"default icon name {dftname} not found")
@@ -1080,33 +1132,21 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         #   WE MUST find a default, system font at least
         default_label_font = self.get_attribute("label-font")
         if default_label_font is not None:
-            if default_label_font not in self._cd_fonts.keys():
-                f = locate_font(default_label_font)
-                if f is not None:  # found one, perfect
-                    self._cd_fonts[default_label_font] = f
-                    self.set_default("default-font", default_label_font)
-                    logger.debug(f"default font set to {default_label_font}")
-                    logger.debug(f"default label font set to {default_label_font}")
-                    logger.info(f"added default label font {default_label_font}")
-            else:
-                logger.debug(f"default label font is {default_label_font}")
+            if self.add_default_font(default_label_font, "label"):  # found one, perfect
+                self.set_default("default-font", default_label_font)
+                logger.debug(f"default font set to {default_label_font}")
+                logger.debug(f"default label font set to {default_label_font}")
         else:
             logger.warning("no default label font specified")
 
         default_system_font = self.get_attribute("system-font")
         if default_system_font is not None:
-            if default_system_font not in self._cd_fonts.keys():
-                f = locate_font(default_system_font)
-                if f is not None:  # found it, perfect, keep it as default font for all purposes
-                    self._cd_fonts[default_system_font] = f
-                    self.set_default("default-font", default_system_font)
-                    logger.debug(f"default font set to {default_system_font}")
-                    if default_label_font is None:  # additionnally, if we don't have a default label font, use it
-                        self.set_default("default-label-font", default_system_font)
-                        logger.debug(f"default label font set to {default_system_font}")
-                    logger.info(f"added default system font {default_system_font}")
-            else:
-                logger.debug(f"default system font is {default_system_font}")
+            if self.add_default_font(default_system_font, "system"):  # found it, perfect, keep it as default font for all purposes
+                self.set_default("default-font", default_system_font)
+                logger.debug(f"default font set to {default_system_font}")
+                if default_label_font is None:  # additionnally, if we don't have a default label font, use it
+                    self.set_default("default-label-font", default_system_font)
+                    logger.debug(f"default label font set to {default_system_font}")
         else:
             logger.warning("no default system font specified")
 
@@ -1114,7 +1154,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         self.fonts = self._cd_fonts | self._ac_fonts
 
         if default_label_font is None and len(self.fonts) > 0:
-            first_one = list(self.fonts.keys())[0]
+            first_one = next(iter(self.fonts))
             self.set_default("default-label-font", first_one)
             self.set_default("default-font", first_one)
             logger.debug(f"no default font found, using first available font ({first_one})")
@@ -1148,15 +1188,15 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
             serial = device.get_serial_number()
             if serial in EXCLUDE_DECKS:
                 logger.warning(f"deck {serial} excluded")
-                del decks[name]
+                continue
             logger.info(f"added virtual deck {name}, type {device.virtual_deck_config.get('type', 'type-not-found')}, serial {serial})")
-            self.devices.append(
-                {
-                    CONFIG_KW.DRIVER.value: VIRTUAL_DECK_DRIVER,
-                    CONFIG_KW.DEVICE.value: device,
-                    CONFIG_KW.SERIAL.value: serial,
-                }
-            )
+            entry = {
+                CONFIG_KW.DRIVER.value: VIRTUAL_DECK_DRIVER,
+                CONFIG_KW.DEVICE.value: device,
+                CONFIG_KW.SERIAL.value: serial,
+            }
+            self.devices.append(entry)
+            self._devices_by_serial[serial] = entry
             cnt = cnt + 1
         self.virtual_decks_added = True
         logger.debug(f"added {cnt} virtual decks")
@@ -1171,14 +1211,21 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
                 to_remove.append(device)
         for device in to_remove:
             self.devices.remove(device)
+            self._devices_by_serial.pop(device.get(CONFIG_KW.SERIAL.value), None)
         self.virtual_decks_added = False
         logger.info(f"removed {len(to_remove)} virtual decks")
 
-    def create_decks(self):
+    def load_aircraft_config(self):
+        # Parsed once per aircraft load, used by resource loading and deck creation
         fn = os.path.join(self.acpath, CONFIG_FOLDER, CONFIG_FILE)
-        self._config = Config(fn)
+        cache_file = self.get_attribute("cache-config")  # parsed content also saved next to the file for next start
+        self._config = Config(fn, cache=True, cache_file=cache_file)  # not parsed again on reload if unchanged
         if not self._config.is_valid():
             logger.warning(f"no config file {fn} or file is invalid")
+
+    def create_decks(self):
+        fn = os.path.join(self.acpath, CONFIG_FOLDER, CONFIG_FILE)
+        if not self._config.is_valid():  # loaded and reported in load_aircraft_config()
             return
         self.named_colors.update(self._config.get(CONFIG_KW.NAMED_COLORS.value, {}))
         if (n := len(self.named_colors)) > 0:
@@ -1193,7 +1240,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         logger.info(f"theme is {self.theme} (was {before})")
 
         sn = os.path.join(self.acpath, CONFIG_FOLDER, SECRET_FILE)
-        serial_numbers = Config(sn)
+        serial_numbers = Config(sn, cache=True, cache_file=False)
         if not serial_numbers.is_valid():
             self._secret = {}
             logger.warning(f"secret file {sn} is not valid")
@@ -1217,16 +1264,13 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         # tally
         for deck in decks:
             ty = deck.get(CONFIG_KW.TYPE.value)
-            if ty in deck_count_by_type:
-                deck_count_by_type[ty] = deck_count_by_type[ty] + 1
-            else:
-                deck_count_by_type[ty] = 1
+            deck_count_by_type[ty] = deck_count_by_type.get(ty, 0) + 1
 
-        cnt = 0
+        cnt = 0  # decks added so far, used to name unnamed decks
         self.virtual_deck_list = {}
 
         for deck_config in decks:
-            name = deck_config.get(CONFIG_KW.NAME.value, f"Deck {cnt}")
+            name = deck_config[CONFIG_KW.NAME.value] if CONFIG_KW.NAME.value in deck_config else f"Deck {cnt}"
 
             disabled = deck_config.get(CONFIG_KW.DISABLED.value)
             if type(disabled) is not bool:
@@ -1239,12 +1283,13 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
                 continue
 
             deck_type = deck_config.get(CONFIG_KW.TYPE.value)
-            if deck_type not in self.deck_types.keys():
+            deck_type_desc = self.deck_types.get(deck_type)
+            if deck_type_desc is None:
                 logger.warning(f"invalid deck type {deck_type}, ignoring")
                 continue
 
-            deck_driver = self.deck_types[deck_type].get(CONFIG_KW.DRIVER.value)
-            if deck_driver not in self.all_deck_drivers.keys():
+            deck_driver = deck_type_desc.get(CONFIG_KW.DRIVER.value)
+            if deck_driver not in self.all_deck_drivers:
                 logger.warning(f"invalid deck driver {deck_driver}, ignoring")
                 continue
 
@@ -1265,25 +1310,28 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
                             "only one deck of that type but more than one configuration in config.yaml for decks of that type and no serial number, ignoring"
                         )
                         continue
-                    deck_config[CONFIG_KW.SERIAL.value] = device.get_serial_number()  # issue: might return None?
+                    # serial number was read when devices were scanned, no need to ask the device again
+                    deck_config[CONFIG_KW.SERIAL.value] = next(
+                        (d[CONFIG_KW.SERIAL.value] for d in self.devices if d[CONFIG_KW.DEVICE.value] is device), None
+                    )  # issue: might return None?
                     logger.info(f"deck {deck_type} {name} has serial {deck_config[CONFIG_KW.SERIAL.value]}")
                 else:
                     deck_config[CONFIG_KW.SERIAL.value] = serial
-                if name not in self.cockpit.keys():
+                if name not in self.cockpit:
                     self.cockpit[name] = self.all_deck_drivers[deck_driver][0](name=name, config=deck_config, cockpit=self, device=device)
                     if deck_driver == VIRTUAL_DECK_DRIVER:
-                        deck_flat = self.deck_types.get(deck_type).desc()
+                        deck_flat = deck_type_desc.desc()
                         if DECK_KW.BACKGROUND.value in deck_flat and DECK_KW.IMAGE.value in deck_flat[DECK_KW.BACKGROUND.value]:
                             background = deck_flat[DECK_KW.BACKGROUND.value]
                             fn = background[DECK_KW.IMAGE.value]
-                            if self.deck_types.get(deck_type)._aircraft:
+                            if deck_type_desc._aircraft:
                                 if not fn.startswith(AIRCRAFT_ASSET_PATH):
                                     background[DECK_KW.IMAGE.value] = AIRCRAFT_ASSET_PATH + fn
                             else:
                                 if not fn.startswith(COCKPITDECKS_ASSET_PATH):
                                     background[DECK_KW.IMAGE.value] = COCKPITDECKS_ASSET_PATH + fn
                         self.virtual_deck_list[name] = deck_config | {
-                            DECK_TYPE_ORIGINAL: self.deck_types.get(deck_type).store,
+                            DECK_TYPE_ORIGINAL: deck_type_desc.store,
                             DECK_TYPE_DESCRIPTION: deck_flat,
                         }
                     cnt = cnt + 1
@@ -1327,7 +1375,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
             config = {
                 CONFIG_KW.NAME.value: name,
                 CONFIG_KW.TYPE.value: device.deck_type(),
-                CONFIG_KW.SERIAL.value: device.get_serial_number(),
+                CONFIG_KW.SERIAL.value: deck[CONFIG_KW.SERIAL.value],  # read when devices were scanned
                 CONFIG_KW.LAYOUT.value: None,  # Streamdeck will detect None layout and present default deck
                 "brightness": 75,  # Note: layout=None is not the same as no layout attribute (attribute missing)
             }
@@ -1337,7 +1385,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         fn = os.path.abspath(os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, OBSERVABLES_FILE))
         if os.path.exists(fn):
             config = {}
-            with open(fn, "r") as fp:
+            with open(fn, "rb") as fp:
                 config = yaml.load(fp)
             self._cd_observables = Observables(config=config, simulator=self.sim)
             logger.info(f"loaded {len(self._cd_observables.observables)} observables")
@@ -1350,7 +1398,7 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         fn = os.path.abspath(os.path.join(self.acpath, CONFIG_FOLDER, RESOURCES_FOLDER, OBSERVABLES_FILE))
         if os.path.exists(fn):
             config = {}
-            with open(fn, "r") as fp:
+            with open(fn, "rb") as fp:
                 config = yaml.load(fp)
             self._ac_observables = Observables(config=config, simulator=self.sim)
             self.observables = {o.name: o for o in self._cd_observables.observables} | {o.name: o for o in self._ac_observables.observables}
@@ -1420,46 +1468,62 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
     def get_deck_type(self, name: str):
         return self.deck_types.get(name)
 
+    def load_icons(self, dn: str, cache_icon: bool, what: str = "icons") -> IconDict:
+        # Loads all icons in folder dn.
+        # Icons are only registered here, they are decoded on first use (see IconDict).
+        # The cache holds raw pixel data {name: (mode, size, bytes)} rather than pickled Image objects,
+        # it is one contiguous read and images are rebuilt with Image.frombytes.
+        icons = IconDict()
+        cache = os.path.join(dn, ICON_CACHE_FILE)
+        if os.path.exists(cache) and cache_icon:
+            with open(cache, "rb") as fp:
+                raw = pickle.load(fp)
+            icons = IconDict(raw)  # images are rebuilt on first use
+            logger.info(f"{len(icons)} {what} loaded from cache")
+            return icons
+
+        with os.scandir(dn) as entries:  # entries carry their path and file type, no extra stat()
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                i = entry.name
+                fn = entry.path
+                if has_ext(i, "png"):  # later, might load JPG as well.
+                    icons[sys.intern(i)] = fn  # icon names are looked up over and over
+                elif has_ext(i, "svg"):  # Wow.
+                    try:
+                        fout = fn.replace(".svg", ".png")
+                        from cairosvg import svg2png  # imported on first svg icon only, it loads cairo
+
+                        svg2png(url=fn, write_to=fout)
+                        icons[sys.intern(i)] = fout
+                    except:
+                        logger.warning(f"could not load icon {fn}")
+                        pass  # no cairosvg
+
+        if cache_icon:
+            # PNG decoding happens in zlib/libpng which release the GIL, decode icons concurrently
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                raw = dict(zip(icons.keys(), executor.map(IconDict.raw, icons.values())))
+            with open(cache, "wb") as fp:
+                pickle.dump(raw, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            logger.info(f"{len(icons)} {what} cached")
+        else:
+            logger.info(f"{len(icons)} {what} loaded")
+        return icons
+
     def load_cd_icons(self):
         # Loading default icons
         #
         cache_icon = self.get_attribute("cache-icon")
         dn = os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, ICONS_FOLDER)
         if os.path.exists(dn):
-            cache = os.path.join(dn, "_icon_cache.pickle")
-            if os.path.exists(cache) and cache_icon:
-                with open(cache, "rb") as fp:
-                    self._cd_icons = pickle.load(fp)
-                logger.info(f"{len(self._cd_icons)} icons loaded from cache")
-            else:
-                icons = os.listdir(dn)
-                for i in icons:
-                    fn = os.path.join(dn, i)
-                    if has_ext(i, "png"):  # later, might load JPG as well.
-                        image = Image.open(fn)
-                        self._cd_icons[i] = image
-                    elif has_ext(i, "svg"):  # Wow.
-                        try:
-                            fn = os.path.join(dn, i)
-                            fout = fn.replace(".svg", ".png")
-                            svg2png(url=fn, write_to=fout)
-                            image = Image.open(fout)
-                            self._cd_icons[i] = image
-                        except:
-                            logger.warning(f"could not load icon {fn}")
-                            pass  # no cairosvg
+            self._cd_icons = self.load_icons(dn, cache_icon, "icons")
 
-                if cache_icon:  # we cache both folders of icons
-                    with open(cache, "wb") as fp:
-                        pickle.dump(self._cd_icons, fp)
-                    logger.info(f"{len(self._cd_icons)} icons cached")
-                else:
-                    logger.info(f"{len(self._cd_icons)} icons loaded")
-
-        self.icons = self._cd_icons | self._ac_icons
+        self.icons = IconDict(self._cd_icons | self._ac_icons)
 
         dftname = self.get_attribute("icon-name")
-        if dftname in self._cd_icons.keys():
+        if dftname in self._cd_icons:
             logger.info(f"default icon name {dftname} found")
         else:
             logger.warning(f"default icon name {dftname} not found in default icons")
@@ -1494,41 +1558,13 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         cache_icon = self.get_attribute("cache-icon")
         dn = os.path.join(self.acpath, CONFIG_FOLDER, RESOURCES_FOLDER, ICONS_FOLDER)
         if os.path.exists(dn):
-            cache = os.path.join(dn, "_icon_cache.pickle")
-            if os.path.exists(cache) and cache_icon:
-                with open(cache, "rb") as fp:
-                    self._ac_icons = pickle.load(fp)
-                logger.info(f"{len(self._ac_icons)} aircraft icons loaded from cache")
-            else:
-                icons = os.listdir(dn)
-                for i in icons:
-                    fn = os.path.join(dn, i)
-                    if has_ext(i, "png"):  # later, might load JPG as well.
-                        image = Image.open(fn)
-                        self._ac_icons[i] = image
-                    elif has_ext(i, "svg"):  # Wow.
-                        try:
-                            fn = os.path.join(dn, i)
-                            fout = fn.replace(".svg", ".png")
-                            svg2png(url=fn, write_to=fout)
-                            image = Image.open(fout)
-                            self._ac_icons[i] = image
-                        except:
-                            logger.warning(f"could not load icon {fn}")
-                            pass  # no cairosvg
+            self._ac_icons = self.load_icons(dn, cache_icon, "aircraft icons")
 
-                if cache_icon:  # we cache both folders of icons
-                    with open(cache, "wb") as fp:
-                        pickle.dump(self._ac_icons, fp)
-                    logger.info(f"{len(self._ac_icons)} aircraft icons cached")
-                else:
-                    logger.info(f"{len(self._ac_icons)} aircraft icons loaded")
-
-        self.icons = self._cd_icons | self._ac_icons
+        self.icons = IconDict(self._cd_icons | self._ac_icons)
         logger.info(f"{len(self.icons)} icons available")
 
         dftname = self.get_attribute("icon-name")
-        if dftname in self.icons.keys():
+        if dftname in self.icons:
             logger.debug(f"default icon name {dftname} found")
         else:
             logger.warning(f"default icon name {dftname} not found")  # that's ok
@@ -1536,9 +1572,9 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
     def get_icon(self, candidate_icon):
         for ext in ["", ".png", ".jpg", ".jpeg"]:
             fn = add_ext(candidate_icon, ext)
-            if fn in self.icons.keys():
+            if fn in self.icons:
                 logger.debug(f"Cockpit: icon {fn} found")
-                return fn
+                return sys.intern(fn)  # same string object as the icons key
         logger.warning(f"Cockpit: icon not found {candidate_icon}")  # , available={self.icons.keys()}
         return None
 
@@ -1555,18 +1591,17 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         #
         rn = os.path.join(os.path.dirname(__file__), RESOURCES_FOLDER, FONTS_FOLDER)
         if os.path.exists(rn):
-            fonts = os.listdir(rn)
-            for i in fonts:
-                if has_ext(i, ".ttf") or has_ext(i, ".otf"):
-                    if i not in self._cd_fonts.keys():
-                        fn = os.path.join(rn, i)
-                        try:
-                            test = ImageFont.truetype(fn, self.get_attribute("label-size", DEFAULT_LABEL_SIZE))
-                            self._cd_fonts[i] = fn
-                        except:
-                            logger.warning(f"font file {fn} not loaded")
-                    else:
-                        logger.debug(f"font {i} already loaded")
+            with os.scandir(rn) as entries:
+                for entry in entries:
+                    i = entry.name
+                    if has_ext(i, ".ttf") or has_ext(i, ".otf"):
+                        if i not in self._cd_fonts:
+                            if entry.is_file():  # font file is parsed when first used
+                                self._cd_fonts[sys.intern(i)] = entry.path
+                            else:
+                                logger.warning(f"font file {entry.path} not loaded")
+                        else:
+                            logger.debug(f"font {i} already loaded")
 
         self.fonts = self._cd_fonts | self._ac_fonts
         logger.info(
@@ -1583,18 +1618,17 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         #
         dn = os.path.join(self.acpath, CONFIG_FOLDER, RESOURCES_FOLDER, FONTS_FOLDER)
         if os.path.exists(dn):
-            fonts = os.listdir(dn)
-            for i in fonts:
-                if has_ext(i, ".ttf") or has_ext(i, ".otf"):
-                    if i not in self._ac_fonts.keys():
-                        fn = os.path.join(dn, i)
-                        try:
-                            test = ImageFont.truetype(fn, self.get_attribute("label-size", DEFAULT_LABEL_SIZE))
-                            self._ac_fonts[i] = fn
-                        except:
-                            logger.warning(f"aircraft font file {fn} not loaded")
-                    else:
-                        logger.debug(f"aircraft font {i} already loaded")
+            with os.scandir(dn) as entries:
+                for entry in entries:
+                    i = entry.name
+                    if has_ext(i, ".ttf") or has_ext(i, ".otf"):
+                        if i not in self._ac_fonts:
+                            if entry.is_file():  # font file is parsed when first used
+                                self._ac_fonts[sys.intern(i)] = entry.path
+                            else:
+                                logger.warning(f"aircraft font file {entry.path} not loaded")
+                        else:
+                            logger.debug(f"aircraft font {i} already loaded")
 
         logger.info(f"{len(self._ac_fonts)} aircraft fonts loaded")
         self.fonts = self._cd_fonts | self._ac_fonts
@@ -1699,31 +1733,40 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         logger.debug("starting event loop..")
 
         while self.event_loop_run:
-            e = self.event_queue.get()  # blocks infinitely here
-
-            if type(e) is str:
-                if e == "terminate":
-                    self.stop_event_loop()
-                elif e == "reload":
-                    self.reload_decks(just_do_it=True)
-                elif e.startswith("reload:"):
-                    deck = e.replace("reload:", "")
-                    self.reload_deck(deck, just_do_it=True)
-                elif e == "stop":
-                    self.stop_decks(just_do_it=True)
-                self.inc("event_count_" + e)
-                continue
+            batch = [self.event_queue.get()]  # blocks infinitely here
+            while True:  # takes all events already queued in the same wake up
+                try:
+                    batch.append(self.event_queue.get_nowait())
+                except Empty:
+                    break
+
+            for e in batch:
+                if not self.event_loop_run:  # terminated by a previous event of the batch
+                    break
+
+                if type(e) is str:
+                    if e == "terminate":
+                        self.stop_event_loop()
+                    elif e == "reload":
+                        self.reload_decks(just_do_it=True)
+                    elif e.startswith("reload:"):
+                        deck = e.replace("reload:", "")
+                        self.reload_deck(deck, just_do_it=True)
+                    elif e == "stop":
+                        self.stop_decks(just_do_it=True)
+                    self.inc("event_count_" + e)
+                    continue
 
-            try:
-                logger.debug(f"doing {e}..")
-                self.inc("event_count_" + type(e).__name__)
-                if EVENTLOGFILE is not None and (LOG_DATAREF_EVENTS or not isinstance(e, SimulatorEvent)) and not e.is_replay():
-                    # we do not enqueue events that are replayed
-                    event_logger.info(e.to_json())
-                e.run(just_do_it=True)
-                logger.debug("..done without error")
-            except:
-                logger.warning("..done with error", exc_info=True)
+                try:
+                    logger.debug(f"doing {e}..")
+                    self.inc("event_count_" + type(e).__name__)
+                    if EVENTLOGFILE is not None and (LOG_DATAREF_EVENTS or not isinstance(e, SimulatorEvent)) and not e.is_replay():
+                        # we do not enqueue events that are replayed
+                        event_logger.info(e.to_json())
+                    e.run(just_do_it=True)
+                    logger.debug("..done without error")
+                except:
+                    logger.warning("..done with error", exc_info=True)
 
         logger.debug(".. event loop ended")
 
@@ -2148,12 +2191,14 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
         else:
             logger.info("no pending thread")
         logger.info("..cockpit terminated")
+        self.terminated.set()
 
     def run(self, release: bool = False):
         if len(self.cockpit) > 0:
             # Each deck should have been started
             # Start reload loop
             logger.info("starting cockpit..")
+            self.terminated.clear()
             self.sim.connect()
             logger.info("..usb monitoring started..")
             self.usb_monitor.start_monitoring(on_connect=self.on_usb_connect, on_disconnect=self.on_usb_disconnect, check_every_seconds=2.0)
@@ -2168,11 +2213,8 @@ class Cockpit(SimulatorVariableListener, InstructionFactory, CockpitBase):
             logger.info("..cockpit started")
             if not release or not self.has_web_decks():
                 logger.info(f"serving {self.name}")
-                for t in threading.enumerate():
-                    try:
-                        t.join()
-                    except RuntimeError:
-                        pass
+                # Daemon threads (animations, deck writers...) never end by themselves, joining them would block forever
+                self.terminated.wait()
                 logger.info("terminated")
             logger.info(f"serving {self.name} (released)")
         else:
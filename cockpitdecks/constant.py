@@ -6,7 +6,10 @@
 #
 import os
 import logging
-from typing import List
+import hashlib
+import marshal
+import pickle
+from typing import FrozenSet
 from collections.abc import MutableMapping
 from enum import Enum
 import ruamel
@@ -22,7 +25,7 @@ from ruamel.yaml import YAML
 #
 # ROOT_DEBUG = "cockpitdecks.xplaneudp,cockpitdecks.xplane,cockpitdecks.button"
 ROOT_DEBUG = ""
-EXCLUDE_DECKS: List[str] = []  # list serial numbers of deck not usable by Streadecks
+EXCLUDE_DECKS: FrozenSet[str] = frozenset()  # serial numbers of deck not usable by Streadecks
 DEFAULT_FREQUENCY = 3
 
 # File & folder names
@@ -43,12 +46,17 @@ TYPES_FOLDER = "types"
 
 ASSETS_FOLDER = "assets"
 TEMPLATES_FOLDER = "templates"
+CONFIG_CACHE_FOLDER = ".cache"  # parsed yaml files, next to the files
+CONFIG_CACHE = {}  # filename: serialized (stamp, content), shared by decks that use the same layout
+ICON_CACHE_FILE = "_icon_cache.bin"  # {name: (mode, size, raw bytes)}, pickled
+ICON_RAW_MODES = frozenset({"1", "L", "LA", "RGB", "RGBA"})  # modes that round trip through tobytes()/frombytes()
 
 DEFAULT_LAYOUT = "default"
 DEFAULT_PAGE_NAME = "Default Page"
 
 ICON_SIZE = 256  # px
 DEFAULT_LABEL_POSITION = "cm"
+VALID_LABEL_POSITIONS = frozenset(h + v for h in "lcr" for v in "tmb")  # horizontal (left, center, right) + vertical (top, middle, bottom)
 DEFAULT_LABEL_SIZE = 12
 NAMED_COLORS = {}  # name: tuple()
 
@@ -113,6 +121,7 @@ class ENVIRON_KW(Enum):
 # System default values
 COCKPITDECKS_DEFAULT_VALUES = {
     "cache-icon": True,
+    "cache-config": True,
     "system-font": "Monaco.ttf",  # alias
     "cockpit-color": "cornflowerblue",  # there are no default-* for the following three values
     "cockpit-texture": None,
@@ -276,7 +285,7 @@ class DECK_FEEDBACK(Enum):
 # https://stackoverflow.com/questions/64716894/ruamel-yaml-disabling-alias-for-dumping
 ruamel.yaml.representer.RoundTripRepresenter.ignore_aliases = lambda x, y: True
 
-yaml = YAML(typ="safe", pure=True)
+yaml = YAML(typ="safe")  # uses libyaml based C parser and emitter (ruamel.yaml.clib) when available, pure python otherwise
 yaml.default_flow_style = False
 
 init_logger = logging.getLogger(__name__)
@@ -291,24 +300,84 @@ CONFIG_FILENAME = "__filename__"
 class Config(MutableMapping):
     """
     A dictionary that loads from a yaml config file.
+    If cache is True, the parsed content is serialized in a CONFIG_CACHE_FOLDER next to the file
+    and reused as long as the file content is the same (content hash, not modification time).
+    Content is serialized with marshal, or pickle if it contains other types than plain python ones (dates...).
+    Serialized content is also kept in memory, each load gets its own copy since callers modify it.
+    If cache_file is False, serialized content is only kept in memory, nothing is written next to the file.
     """
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, cache: bool = False, cache_file: bool = True):
+        self.cache_file = cache_file
         self.store = dict()
         if os.path.exists(filename):
             filename = os.path.abspath(filename)
             dirname = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "")
             try:
-                with open(filename, "r") as fp:
-                    self.store = yaml.load(fp)
-                    self.store[CONFIG_FILENAME] = filename
-                    init_logger.info(f"loaded config from {os.path.abspath(filename).replace(dirname, '')}")
+                stamp = None
+                if cache:
+                    with open(filename, "rb") as fp:
+                        content = fp.read()  # hashing is much cheaper than parsing
+                    stamp = hashlib.blake2b(content, digest_size=16).digest()
+                    self.store = self.load_cache(filename, stamp)
+                    if self.store is None or len(self.store) == 0:
+                        self.store = yaml.load(content)
+                        self.save_cache(filename, stamp)
+                else:
+                    with open(filename, "rb", buffering=131072) as fp:  # parser reads and decodes bytes itself
+                        self.store = yaml.load(fp)
+                self.store[CONFIG_FILENAME] = filename
+                init_logger.info(f"loaded config from {os.path.abspath(filename).replace(dirname, '')}")
             except:
+                if self.store is None:
+                    self.store = dict()
                 self.store[CONFIG_FILENAME] = filename
                 init_logger.warning(f"error loading config from {os.path.abspath(filename).replace(dirname, '')}", exc_info=True)
         else:
             init_logger.warning(f"no file {filename}")
 
+    @staticmethod
+    def cache_filename(filename: str) -> str:
+        return os.path.join(os.path.dirname(filename), CONFIG_CACHE_FOLDER, os.path.basename(filename) + ".bin")
+
+    def load_cache(self, filename: str, stamp: tuple) -> dict | None:
+        cache = Config.cache_filename(filename)
+        try:
+            data = CONFIG_CACHE.get(filename)
+            if data is None:
+                if not self.cache_file or not os.path.exists(cache):
+                    return None
+                with open(cache, "rb") as fp:
+                    data = fp.read()
+            if data[:1] == b"M":
+                cached_stamp, store = marshal.loads(data[1:])
+            elif data[:1] == b"P":
+                cached_stamp, store = pickle.loads(data[1:])
+            else:
+                return None
+            if cached_stamp == stamp:
+                CONFIG_CACHE[filename] = data
+                return store
+        except:
+            init_logger.debug(f"cannot load cache {cache}", exc_info=True)
+        return None
+
+    def save_cache(self, filename: str, stamp: tuple):
+        cache = Config.cache_filename(filename)
+        try:
+            try:
+                data = b"M" + marshal.dumps((stamp, self.store))
+            except ValueError:  # unmarshallable type
+                data = b"P" + pickle.dumps((stamp, self.store))
+            CONFIG_CACHE[filename] = data
+            if not self.cache_file:
+                return
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+            with open(cache, "wb") as fp:
+                fp.write(data)
+        except:
+            init_logger.debug(f"cannot save cache {cache}", exc_info=True)
+
     def __getitem__(self, key):
         return self.store[self._keytransform(key)]
 
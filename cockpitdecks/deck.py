@@ -2,8 +2,9 @@
 #
 import os
 import logging
+from collections import deque
 
-from typing import Dict, List, Any
+from typing import Dict, Any
 from abc import ABC, abstractmethod
 
 from PIL import Image
@@ -23,6 +24,21 @@ from .button import Button
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
 
+PAGE_HISTORY_SIZE = 64  # page names remembered for back page, oldest are forgotten
+
+# Uniform color images, shared by all decks, (width, height, color): image.
+# Never drawn on, users get a copy.
+SOLID_ICON_CACHE = {}
+
+
+def solid_icon(width: int, height: int, color):
+    key = (width, height, color)
+    image = SOLID_ICON_CACHE.get(key)
+    if image is None:
+        image = Image.new(mode="RGBA", size=(width, height), color=color)
+        SOLID_ICON_CACHE[key] = image
+    return image
+
 
 class Deck(ABC):
     """
@@ -37,6 +53,7 @@ class Deck(ABC):
 
     def __init__(self, name: str, config: dict, cockpit: "Cockpit", device=None):
         self._config = config  # content of aircraft/deckconfig/config.yaml decks attributes for this deck
+        self._attributes = {}  # (attribute, default, propagate): resolved value, see get_attribute()
         self.cockpit = cockpit
         self.sim = cockpit.sim
         self.cockpit.set_logging_level(__name__)
@@ -62,7 +79,7 @@ class Deck(ABC):
         self.home_page: Page | None = None
         self.current_page: Page | None = None
         self.previous_page: Page | None = None
-        self.page_history: List[str] = []
+        self.page_history: deque[str] = deque(maxlen=PAGE_HISTORY_SIZE)
 
         self.brightness = int(config.get("brightness", 100))
 
@@ -127,6 +144,24 @@ class Deck(ABC):
     def get_attribute(self, attribute: str, default=None, propagate: bool = True, silence: bool = True) -> Any or None:
         """Returns the default attribute value
 
+        Deck and layout configurations do not change while the deck is loaded (reload creates new decks),
+        resolved values are kept and returned directly on subsequent requests.
+        """
+        if not silence:  # caller wants to see the resolution
+            return self.resolve_attribute(attribute=attribute, default=default, propagate=propagate, silence=silence)
+        key = (attribute, default, propagate)
+        try:
+            if key in self._attributes:
+                return self._attributes[key]
+        except TypeError:  # unhashable default value
+            return self.resolve_attribute(attribute=attribute, default=default, propagate=propagate, silence=silence)
+        value = self.resolve_attribute(attribute=attribute, default=default, propagate=propagate, silence=silence)
+        self._attributes[key] = value
+        return value
+
+    def resolve_attribute(self, attribute: str, default=None, propagate: bool = True, silence: bool = True) -> Any or None:
+        """Returns the default attribute value
+
         ..if avaialble at the deck level.
         If not, returns the parent's default attribute value (cockpit).
 
@@ -246,9 +281,14 @@ class Deck(ABC):
             self.make_default_page()
             return
 
-        pages = os.listdir(dn)
-        if CONFIG_FILE in pages:  # first load config
-            self._layout_config = Config(os.path.join(dn, CONFIG_FILE))
+        cache_config = self.cockpit.get_attribute("cache-config")
+        display_dn = os.path.join(self.cockpit.acpath, CONFIG_FOLDER + os.sep)  # removed from file names in messages
+        with os.scandir(dn) as it:  # directory entries carry their type, no stat() per file
+            pages = [e for e in it if e.is_file()]
+        layout_config = next((e for e in pages if e.name == CONFIG_FILE), None)
+        if layout_config is not None:  # first load config
+            self._layout_config = Config(layout_config.path)
+            self._attributes = {}  # resolved with no layout so far
             if not self._layout_config.is_valid():
                 logger.debug("no layout config file")
             else:  # get new value if it exists
@@ -256,39 +296,46 @@ class Deck(ABC):
                 self.logo = self.get_attribute("logo", self.logo)
                 self.wallpaper = self.get_attribute("wallpaper", self.wallpaper)
 
-        for p in pages:
+        for e in pages:
+            p = e.name
             if p == CONFIG_FILE:
                 continue
-            elif not (p.lower().endswith(".yaml") or p.lower().endswith(".yml")):  # not a yaml file
+            page_name, ext = os.path.splitext(p)
+            ext = ext.lower()
+            if ext not in (".yaml", ".yml"):  # not a yaml file
                 logger.debug(f"{dn}: ignoring file {p}")
                 continue
-            elif p.lower().endswith(".inc.yaml"):  # a special include file
+            elif ext == ".yaml" and page_name.lower().endswith(".inc"):  # a special include file
                 logger.debug(f"{dn}: file {p} is an include")
                 continue
 
-            fn = os.path.join(dn, p)
+            fn = e.path
             # if os.path.exists(fn):  # we know the file should exists...
-            page_config = Config(fn)
+            page_config = Config(fn, cache=cache_config)
             if not page_config.is_valid():
                 logger.warning(f"file {p} not found or invalid")
                 continue
 
             verbose = page_config.get("verbose", False)
 
-            page_name = ".".join(p.split(".")[:-1])  # build default page name, remove extension ".yaml" or ".yml" from filename
+            # default page name is filename without extension ".yaml" or ".yml"
             if CONFIG_KW.NAME.value in page_config:
                 page_name = page_config[CONFIG_KW.NAME.value]
 
-            if page_name in self.pages.keys():
+            if page_name in self.pages:
                 logger.warning(f"page {page_name}: duplicate name, ignored")
                 continue
 
-            if not CONFIG_KW.BUTTONS.value in page_config:
+            page_buttons = page_config.get(CONFIG_KW.BUTTONS.value)
+            if page_buttons is None:
                 logger.error(f"{page_name} has no button definition '{CONFIG_KW.BUTTONS.value}', ignoring")
                 continue
 
-            display_fn = fn.replace(os.path.join(self.cockpit.acpath, CONFIG_FOLDER + os.sep), "..")
-            logger.debug(f"loading page {page_name} (from file {display_fn})..")
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if verbose or debug:  # only used in messages
+                display_fn = fn.replace(display_dn, "..")
+            if debug:
+                logger.debug(f"loading page {page_name} (from file {display_fn})..")
 
             doc = page_config.get("info")
             if doc is not None:
@@ -298,12 +345,12 @@ class Deck(ABC):
             self.pages[page_name] = this_page
 
             # Page buttons
-            this_page.load_buttons(buttons=page_config[CONFIG_KW.BUTTONS.value], deck_type=self.deck_type)
+            this_page.load_buttons(buttons=page_buttons, deck_type=self.deck_type)
 
             # Page includes
-            if CONFIG_KW.INCLUDES.value in page_config:
-                includes = page_config[CONFIG_KW.INCLUDES.value]
-                if type(page_config[CONFIG_KW.INCLUDES.value]) is str:  # just one file
+            includes = page_config.get(CONFIG_KW.INCLUDES.value)
+            if includes is not None:
+                if type(includes) is str:  # just one file
                     includes = includes.split(",")
                 logger.debug(f"deck {self.name}: page {page_name} includes {includes}..")
                 ipb = 0
@@ -320,7 +367,7 @@ class Deck(ABC):
                     if not os.path.exists(fni):
                         logger.warning(f"includes: {inc}: file {os.path.join(dn, inc + '.{yaml|yml|txt}')} not found")
                         continue
-                    inc_config = Config(fni)
+                    inc_config = Config(fni, cache=cache_config)
                     if inc_config.is_valid():
                         this_page.merge_attributes(inc_config.store)  # merges attributes first since can have things for buttons....
                         if CONFIG_KW.BUTTONS.value in inc_config:
@@ -330,11 +377,8 @@ class Deck(ABC):
                         del inc_config.store[CONFIG_KW.BUTTONS.value]
                     else:
                         logger.warning(f"includes: {inc}: file {fni} is invalid")
-                display_fni = fni.replace(
-                    os.path.join(self.cockpit.acpath, CONFIG_FOLDER + os.sep),
-                    "..",
-                )
                 if verbose:
+                    display_fni = fni.replace(display_dn, "..")
                     logger.info(f"deck {self.name}: page {page_name} includes {inc} (from file {display_fni}), include contains {ipb} buttons")
                 logger.debug("includes: ..included")
 
@@ -347,14 +391,16 @@ class Deck(ABC):
             # self.load_default_page()
         else:
             self.set_home_page()
-            logger.info(f"deck {self.name}: loaded {len(self.pages)} pages from layout {self.layout}: {', '.join(self.pages.keys())}.")
+            logger.info(f"deck {self.name}: loaded {len(self.pages)} pages from layout {self.layout}: {', '.join(self.pages)}.")
 
-    def change_page(self, page: str | None = None) -> str | None:
+    def change_page(self, page: str | None = None, force: bool = False) -> str | None:
         """Change the deck's page to the one supplied as argument.
            If none supplied, load the default page.
+           If the page is already the current page, nothing is done unless force is True.
 
         Args:
             page ([str | None]): Name of page to load (default: `None`)
+            force (bool): Reset the deck and render the page even if it is the current page (default: `False`)
 
         Returns:
             [str | None]: Name of page loaded or None.
@@ -371,8 +417,11 @@ class Deck(ABC):
                 if self.home_page is not None:
                     page = self.home_page.name
             logger.debug(f"deck {self.name} back page to {page}..")
+        if not force and self.current_page is not None and page == self.current_page.name:
+            logger.debug(f"deck {self.name} page {page} already loaded")
+            return page
         logger.debug(f"deck {self.name} changing page to {page}..")
-        if page in self.pages.keys():
+        if page in self.pages:
             if self.current_page is not None:
                 logger.debug(f"deck {self.name} unloading page {self.current_page.name}..")
                 logger.debug("..unloading simulator variables..")
@@ -406,7 +455,7 @@ class Deck(ABC):
         too heavily modified or interaction with other pages occurred.
         """
         self.inc(INTERNAL_DATAREF.DECK_RELOADS.value)
-        self.change_page(self.current_page.name)
+        self.change_page(self.current_page.name, force=True)
 
     def set_home_page(self):
         """Finds and install the home page, if any."""
@@ -414,11 +463,11 @@ class Deck(ABC):
             self.valid = False
             logger.error(f"deck {self.name} has no page, ignoring")
         else:
-            if self.home_page_name in self.pages.keys():
+            if self.home_page_name in self.pages:
                 self.home_page = self.pages[self.home_page_name]
             else:
                 logger.debug(f"deck {self.name}: no home page named {self.home_page_name}")
-                self.home_page = self.pages[list(self.pages.keys())[0]]  # first page
+                self.home_page = self.pages[next(iter(self.pages))]  # first page
             logger.debug(f"deck {self.name}: home page {self.home_page.name}")
 
     def load_home_page(self):
@@ -454,7 +503,7 @@ class Deck(ABC):
         a = name.split(ID_SEP)
         if len(a) > 0:
             if a[0] == self.name:
-                if a[1] in self.pages.keys():
+                if a[1] in self.pages:
                     return self.pages[a[1]].get_button_value(ID_SEP.join(a[1:]))
                 else:
                     logger.warning(f"so such page {a[1]}")
@@ -614,7 +663,7 @@ class DeckWithIcons(Deck):
             return icons.get(default_icon_name)
         else:
             if len(icons) > 0:
-                first = list(icons.keys())[0]
+                first = next(iter(icons))
                 return icons.get(first)
             else:
                 logger.error("no default icon")
@@ -635,7 +684,8 @@ class DeckWithIcons(Deck):
         return button_def.get_wallpaper()
 
     def create_empty_icon_for_key(self, index):
-        return Image.new(mode="RGBA", size=self.get_image_size(index), color=TRANSPARENT_PNG_COLOR_BLACK)
+        width, height = self.get_image_size(index)
+        return solid_icon(width, height, TRANSPARENT_PNG_COLOR_BLACK).copy()
 
     def get_icon_background(
         self,
@@ -715,7 +765,7 @@ class DeckWithIcons(Deck):
         # if use_texture and texture is None:
         #     logger.debug(f"{who}: should use texture but no texture found, using uniform color")
         color = get_color()
-        image = Image.new(mode="RGBA", size=(width, height), color=color)
+        image = solid_icon(width, height, color).copy()  # callers draw on it
         logger.debug(f"{who}: uniform color {color} (color_in={color_in})")
         self.inc(INTERNAL_DATAREF.RENDER_BG_COLOR.value)
         return image
@@ -802,7 +852,7 @@ class DeckWithIcons(Deck):
         # testing. returns random icon
         page = Page(name="_BUTTONDESIGNER", config={}, deck=self)
         page.load_buttons(buttons=[config], deck_type=self.deck_type)
-        button: Button = page.buttons[list(page.buttons.keys())[0]]
+        button: Button = next(iter(page.buttons.values()))
         representation = button._representation
         if not isinstance(representation, IconBase):
             logger.warning(f"button: representation is not an image ({type(representation)})")
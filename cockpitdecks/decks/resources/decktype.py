@@ -75,6 +75,8 @@ class DeckButton:
         self._config = config
         self._button_block = button_block
         self._inited = False
+        self._valid_activations = None  # (source, names), available activations do not change once source is loaded
+        self._valid_representations = None  # (source, names)
 
         self.name = config.get(DECK_KW.NAME.value, config.get(DECK_KW.INT_NAME.value))
 
@@ -207,17 +209,25 @@ class DeckButton:
             return int(idx.replace(self.prefix, ""))
         return int(idx)
 
-    def valid_activations(self, source) -> set:
+    def valid_activations(self, source) -> frozenset:
+        if self._valid_activations is not None and self._valid_activations[0] is source:
+            return self._valid_activations[1]
         ret = [Activation]  # always valid
         for action in self.actions:
             ret = ret + source.get_activations_for(DECK_ACTIONS(action))
-        return set([x.name() for x in ret if x is not None])  # remove duplicates, remove None
+        names = frozenset([x.name() for x in ret if x is not None])  # remove duplicates, remove None
+        self._valid_activations = (source, names)
+        return names
 
-    def valid_representations(self, source) -> set:
+    def valid_representations(self, source) -> frozenset:
+        if self._valid_representations is not None and self._valid_representations[0] is source:
+            return self._valid_representations[1]
         ret = [Representation]  # always valid
         for feedback in self.feedbacks:
             ret = ret + source.get_representations_for(DECK_FEEDBACK(feedback))
-        return set([x.name() for x in ret if x is not None])  # remove duplicates, remove None
+        names = frozenset([x.name() for x in ret if x is not None])  # remove duplicates, remove None
+        self._valid_representations = (source, names)
+        return names
 
     def has_action(self, action: str) -> bool:
         return action in self.actions
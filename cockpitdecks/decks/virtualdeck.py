@@ -5,6 +5,7 @@
 #
 import socket
 import logging
+import threading
 import io
 import base64
 from datetime import datetime
@@ -30,6 +31,7 @@ logger = logging.getLogger(__name__)
 
 WEB_LOG = False
 NOT_CONNECTED_WARNING = False
+WRITER_STOP_TIMEOUT = 5.0  # seconds, do not block deck termination on a hung websocket send
 
 
 class VirtualDeck(DeckWithIcons):
@@ -43,6 +45,13 @@ class VirtualDeck(DeckWithIcons):
     DEVICE_MANAGER = VirtualDeckManager
 
     def __init__(self, name: str, config: dict, cockpit: "Cockpit", device=None):
+        self._key_images = {}  # key: (last image sent, its base64 PNG encoding), set first, deck may render while initializing
+        # Key images are sent from a writer thread, only the last image of a key waiting to be sent is kept
+        self._pending_images = {}  # key: image
+        self._pending_lock = threading.Lock()
+        self._pending_event = threading.Event()
+        self._writer_thread = None
+        self._writer_run = False
         DeckWithIcons.__init__(self, name=name, config=config, cockpit=cockpit, device=device)
 
         self.cockpit.set_logging_level(__name__)
@@ -95,7 +104,7 @@ class VirtualDeck(DeckWithIcons):
         """
         if self.is_connected():
             self.inc(INTERNAL_DATAREF.DECK_RELOADS.value)
-            self.change_page(self.current_page.name)
+            self.change_page(self.current_page.name, force=True)
         else:
             logger.debug(f"deck {self.name} is not connected")
 
@@ -214,6 +223,53 @@ class VirtualDeck(DeckWithIcons):
         self.cockpit.send(deck=self.name, payload=payload)
 
     def set_key_icon(self, key, image):
+        # Queues the image for the writer thread, replaces an image of the same key not sent yet
+        # Called from several threads (event loop, animations), writer check and start is done under lock
+        # so that there is never more than one writer, images of a key are sent in order.
+        with self._pending_lock:
+            self._pending_images[key] = image
+            if self._writer_thread is None:
+                self.start_writer()
+        self._pending_event.set()
+
+    def start_writer(self):
+        # Must be called with self._pending_lock held
+        self._writer_run = True
+        self._writer_thread = threading.Thread(target=self.writer_loop, name=f"VirtualDeck::{self.name}::writer", daemon=True)
+        self._writer_thread.start()
+        logger.debug(f"deck {self.name}: writer started")
+
+    def stop_writer(self):
+        with self._pending_lock:
+            writer = self._writer_thread
+            if writer is None:
+                return
+            self._writer_run = False
+        self._pending_event.set()
+        writer.join(timeout=WRITER_STOP_TIMEOUT)  # pending images are sent before the thread ends
+        if writer.is_alive():  # left as is, so that no second writer gets started, it is a daemon thread
+            logger.warning(f"deck {self.name}: writer did not stop within {WRITER_STOP_TIMEOUT} seconds")
+            return
+        with self._pending_lock:
+            self._writer_thread = None
+        logger.debug(f"deck {self.name}: writer stopped")
+
+    def writer_loop(self):
+        while True:
+            self._pending_event.wait()
+            self._pending_event.clear()
+            with self._pending_lock:
+                pending = self._pending_images
+                self._pending_images = {}
+            for key, image in pending.items():
+                try:
+                    self.send_key_icon(key, image)
+                except:
+                    logger.warning(f"deck {self.name}: problem sending image for key {key}", exc_info=True)
+            if not self._writer_run and len(self._pending_images) == 0:
+                break
+
+    def send_key_icon(self, key, image):
         # Sends the PIL Image bytes with a few meta to Flask for web display
         # Image is sent as a stream of bytes which is the file content of the image saved in PNG format
         # Need to supply deck name as well.
@@ -234,18 +290,27 @@ class VirtualDeck(DeckWithIcons):
         #     logger.debug(f"deck {self.name} has no client")
         #     return
 
-        buttondef = self.deck_type.get_button_definition(key)
-        rc = buttondef.get_option("corner_radius")
-        # rc = int(image.width / 8)
-        if rc is not None:
-            image = add_corners(image, int(rc))
-        width, height = image.size
-        img_byte_arr = io.BytesIO()
-        # transformed = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)  # ?!
-        image.save(img_byte_arr, format="PNG")
-        content = img_byte_arr.getvalue()
+        # Representations return the same (cached) image object when nothing changed,
+        # the PNG encoding of the last image sent to a key is reused in that case.
+        last = self._key_images.get(key)
+        if last is not None and last[0] is image:
+            encoded = last[1]
+        else:
+            sent = image
+            buttondef = self.deck_type.get_button_definition(key)
+            rc = buttondef.get_option("corner_radius")
+            # rc = int(image.width / 8)
+            if rc is not None:
+                image = add_corners(image.copy(), int(rc))  # image may be cached by its representation
+            width, height = image.size
+            img_byte_arr = io.BytesIO()
+            # transformed = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)  # ?!
+            image.save(img_byte_arr, format="PNG")
+            content = img_byte_arr.getvalue()
+            encoded = base64.encodebytes(content).decode("ascii")
+            self._key_images[key] = (sent, encoded)
         meta = {"ts": datetime.now().timestamp()}  # dummy
-        payload = {"code": 0, "deck": self.name, "key": key, "image": base64.encodebytes(content).decode("ascii"), "meta": meta}
+        payload = {"code": 0, "deck": self.name, "key": key, "image": encoded, "meta": meta}
         self.cockpit.send(deck=self.name, payload=payload)
 
     def fill_empty_hardware_representation(self, key, page):
@@ -279,7 +344,7 @@ class VirtualDeck(DeckWithIcons):
         rc = buttondef.get_option("corner_radius")
         # rc = int(image.width / 8)
         if rc is not None:
-            image = add_corners(image, int(rc))
+            image = add_corners(image.copy(), int(rc))  # image may be cached by its representation
         width, height = image.size
         img_byte_arr = io.BytesIO()
         # transformed = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)  # ?!
@@ -309,6 +374,7 @@ class VirtualDeck(DeckWithIcons):
             return
 
         if image.size != self.get_image_size(button.index):
+            image = image.copy()  # representation images are read-only, they may be cached
             image.thumbnail(self.get_image_size(button.index))
 
         self.set_key_icon(button.index, image)
@@ -362,6 +428,10 @@ class VirtualDeck(DeckWithIcons):
     def stop(self):
         pass
 
+    def terminate(self, disconnected: bool = False):
+        super().terminate(disconnected=disconnected)
+        self.stop_writer()
+
     @staticmethod
     def terminate_device(device, name: str = "unspecified"):
         logger.info(f"{name} terminated")
@@ -167,7 +167,8 @@ class DeckEvent(Event):
                 return False
 
             idx = str(self.button)
-            if idx not in self.deck.current_page.buttons.keys():
+            button = page.buttons.get(idx)
+            if button is None:
                 logger.warning(f"no button {idx} on page {page.name} on deck {self.deck.name}")
                 return False
 
@@ -175,7 +176,7 @@ class DeckEvent(Event):
                 logger.debug(f"doing {idx} on page {page.name} on deck {self.deck.name}..")
                 if not self.is_processed():
                     self.handling()
-                    self.deck.current_page.buttons[idx].activate(self)
+                    button.activate(self)
                     self.handled()
                     logger.debug(f"..done {round(self.duration, 3)}ms")
                 else:
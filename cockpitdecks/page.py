@@ -104,6 +104,10 @@ class Page:
 
     def load_buttons(self, buttons: dict, deck_type: DeckType, add_to_page: bool = True) -> list:
         built = []
+        valid_indices = frozenset(deck_type.valid_indices())
+        cockpit = self.deck.cockpit
+        all_representations = cockpit.all_representations
+        all_hardware_representations = cockpit.all_hardware_representations
         for button_config in buttons:
             try:
                 button = None
@@ -113,13 +117,13 @@ class Page:
                 if idx is None:
                     logger.error(f"page {self.name}: button has no index, ignoring {button_config}")
                     continue
-                if idx not in deck_type.valid_indices():
+                if idx not in valid_indices:
                     logger.error(f"page {self.name}: button has invalid index '{idx}' (valid={deck_type.valid_indices()}), ignoring '{button_config}'")
                     continue
 
                 # How the button will behave, it is does something
                 aty = Button.guess_activation_type(button_config)
-                valid_activations = deck_type.valid_activations(idx, source=self.deck.cockpit)
+                valid_activations = deck_type.valid_activations(idx, source=cockpit)
                 if aty is None or aty not in valid_activations:
                     logger.error(
                         f"page {self.name}: button has invalid activation type {aty} not in {valid_activations} for index {idx}, ignoring {button_config}"
@@ -129,10 +133,10 @@ class Page:
                 # How the button will be represented, if it is
                 rty = Button.guess_representation_type(
                     button_config,
-                    all_representations=self.deck.cockpit.all_representations,
-                    all_hardware_representations=self.deck.cockpit.all_hardware_representations,
+                    all_representations=all_representations,
+                    all_hardware_representations=all_hardware_representations,
                 )
-                valid_representations = deck_type.valid_representations(idx, source=self.deck.cockpit)
+                valid_representations = deck_type.valid_representations(idx, source=cockpit)
                 if rty not in valid_representations:
                     logger.error(
                         f"page {self.name}: button has invalid representation type {rty} not in {valid_representations} for index {idx}, ignoring {button_config}"
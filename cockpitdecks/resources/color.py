@@ -4,6 +4,7 @@ Helper class for color management
 
 import logging
 import colorsys
+from functools import lru_cache
 from typing import Tuple
 
 # import numpy as np
@@ -20,6 +21,8 @@ TRANSPARENT_PNG_COLOR = (255, 255, 255, 0)  # white
 DEFAULT_COLOR_NAME = "grey"
 DEFAULT_COLOR = (128, 128, 128)
 
+COLOR_SEQUENCE_TYPES = (tuple, list)  # colors already given as component values
+
 
 def is_integer(s) -> bool:
     try:
@@ -48,18 +51,24 @@ def convert_color(instr: str | tuple | list | None) -> Tuple[int, int, int] | Tu
     if instr is None:
         return DEFAULT_COLOR
 
-    if type(instr) in [tuple, list]:
-        return tuple(instr)
+    if isinstance(instr, COLOR_SEQUENCE_TYPES):  # tuples are returned as is, no copy
+        return instr if isinstance(instr, tuple) else tuple(instr)
 
-    if type(instr) != str:
+    if not isinstance(instr, str):
         logger.debug(f"color {instr} ({type(instr)}) not found, using {DEFAULT_COLOR}")
         return DEFAULT_COLOR
 
     # it's a string...
+    return convert_color_string(instr)
+
+
+@lru_cache(maxsize=256)
+def convert_color_string(instr: str) -> Tuple[int, int, int] | Tuple[int, int, int, int]:
+    # Colors come from configuration, the same few strings are converted over and over.
     instr = instr.strip()
     if "," in instr and instr.startswith("("):  # "(255, 7, 2)"
         a = instr.replace("(", "").replace(")", "").split(",")
-        return tuple([int(e) for e in a])
+        return tuple([int(e) for e in a])  # non integer values fail as before, failures are not cached
     else:  # it may be a color name...
         try:
             color = ImageColor.getrgb(instr)
@@ -67,8 +76,6 @@ def convert_color(instr: str | tuple | list | None) -> Tuple[int, int, int] | Tu
             logger.debug(f"fail to convert color {instr} ({type(instr)}), using {DEFAULT_COLOR}")
             color = DEFAULT_COLOR
         return tuple(color)
-    logger.debug(f"not a string {instr} ({type(instr)}), using {DEFAULT_COLOR}")
-    return DEFAULT_COLOR
 
 
 def convert_color_hsl(instr) -> Tuple[int, int, int] | Tuple[int, int, int, int]:
@@ -80,28 +87,33 @@ def convert_color_hsl(instr) -> Tuple[int, int, int] | Tuple[int, int, int, int]
 
 def light_off(color: str | Tuple[int, int, int], lightness: float = 0.10) -> Tuple[int, int, int]:
     # Darkens (or lighten) a color
-    temp_color = color if type(color) in [tuple, list] else convert_color(color)
-    a = list(colorsys.rgb_to_hls(*[c / 255 for c in temp_color]))
+    return light_off_rgb(convert_color(color), lightness)
+
+
+@lru_cache(maxsize=256)
+def light_off_rgb(color: Tuple[int, int, int], lightness: float) -> Tuple[int, int, int]:
+    # Few colors are used, conversion results are cached
+    a = list(colorsys.rgb_to_hls(*[c / 255 for c in color]))
     a[1] = lightness
     return tuple([int(c * 256) for c in colorsys.hls_to_rgb(*a)])
 
 
+@lru_cache(maxsize=2048)
 def has_ext(name: str, ext: str) -> bool:
+    # Called with the same few icon and font names over and over
     rext = ext if not ext.startswith(".") else ext[1:]  # remove leading period from extension if any
-    narr = name.split(".")
-    return (len(narr) > 1) and (narr[-1].lower() == rext.lower())
+    _, dot, nameext = name.rpartition(".")
+    return dot != "" and nameext.lower() == rext.lower()
 
 
+@lru_cache(maxsize=2048)
 def add_ext(name: str, ext: str) -> str:
     rext = ext if not ext.startswith(".") else ext[1:]  # remove leading period from extension if any
-    narr = name.split(".")
-    if len(narr) < 2:  # has no extension
-        return name + "." + rext
-    nameext = narr[-1]
-    if nameext.lower() == rext.lower():
-        return ".".join(narr[:-1]) + "." + rext  # force extension to what is should
-    else:  # did not finish with extention, so add it
-        return name + "." + rext  # force extension to what is should
+    base, dot, nameext = name.rpartition(".")
+    if dot != "" and nameext.lower() == rext.lower():
+        return base + "." + rext  # force extension to what is should
+    # has no extension, or did not finish with extention, so add it
+    return name + "." + rext  # force extension to what is should
 
 
 # # https://stackoverflow.com/questions/66837477/pillow-how-to-gradient-fill-drawn-shapes
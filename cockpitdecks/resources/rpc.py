@@ -5,13 +5,25 @@
 # could be used to offer a more "classical" expression writer. Code needs adjustments.
 # This one is soooo simple, so powerful and can easily be extended.
 import math
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def tokenize(expression: str) -> tuple:
+    # Expressions are re-evaluated at each render with mostly identical values,
+    # so the split/float conversion is cached per expression string.
+    tokens = []
+    for part in expression.split(" "):
+        try:
+            tokens.append(float(part))
+        except:
+            tokens.append(part)
+    return tuple(tokens)
 
 
 class RPC:
 
     def __init__(self, expression):
-        self.tokens = []
-
         if type(expression) != str:
             expression = str(expression)
             # print("RPC::__init__: expression is not a string")
@@ -22,11 +34,7 @@ class RPC:
             #     print("RPC::__init__: expression cannot be converted to a float")
             # return
 
-        for part in expression.split(" "):
-            try:
-                self.tokens.append(float(part))
-            except:
-                self.tokens.append(part)
+        self.tokens = tokenize(expression)
 
     def calculate(self, return_stack=False):
         stack = []
@@ -8,7 +8,7 @@ import math
 
 from ruamel.yaml.comments import CommentedMap, CommentedSeq
 
-from cockpitdecks import CONFIG_KW
+from cockpitdecks import CONFIG_KW, VALID_LABEL_POSITIONS
 from cockpitdecks.variable import InternalVariable, ValueProvider, INTERNAL_STATE_PREFIX, PATTERN_DOLCB, PATTERN_INTSTATE
 from cockpitdecks.simulator import Simulator, SimulatorVariableValueProvider
 from cockpitdecks.buttons.activation import ActivationValueProvider
@@ -55,6 +55,7 @@ class Value:
         self._string_simulator_variable: set | None = None
         self._known_extras: Tuple[str] = tuple()
         self._formula: str | None = None
+        self._text_styles = {}  # (id(config), which_text): (config, text style), static for the life of the button
 
         self.init()
 
@@ -455,11 +456,27 @@ class Value:
     # Text substitution
     #
     def get_text_detail(self, config, which_text):
+        text = self.get_text(config, which_text)
+
+        # Text style only depends on (static) configuration, it is resolved once.
+        # (Theme changes reload decks and create new buttons.)
+        key = (id(config), which_text)
+        style = self._text_styles.get(key)
+        if style is None or style[0] is not config:
+            style = (config, self.get_text_style(config, which_text))
+            self._text_styles[key] = style
+        text_format, text_font, text_color, text_size, text_position = style[1]
+
+        if text is not None and not isinstance(text, str):
+            logger.warning(f"button {self._button.name}: converting text {text} to string (type {type(text)})")
+            text = str(text)
+
+        return text, text_format, text_font, text_color, text_size, text_position
+
+    def get_text_style(self, config, which_text):
         DEFAULT_VALID_TEXT_POSITION = "cm"
 
-        text = self.get_text(config, which_text)
         text_format = config.get(f"{which_text}-format")
-        page = self._button.page
 
         dflt_system_font = self._button.get_attribute(f"system-font")
         if dflt_system_font is None:
@@ -498,20 +515,13 @@ class Value:
                 dflt_text_position = DEFAULT_VALID_TEXT_POSITION  # middle of icon
                 logger.warning(f"button {self._button.name}: no default label position, using {dflt_text_position}")
         text_position = config.get(f"{which_text}-position", dflt_text_position)
-        if text_position[0] not in "lcr":
+        if text_position not in VALID_LABEL_POSITIONS:
+            logger.warning(f"button {self._button.name}: {type(self).__name__}: invalid label position code {text_position}, using default")
             text_position = DEFAULT_VALID_TEXT_POSITION
-            logger.warning(f"button {self._button.name}: {type(self).__name__}: invalid horizontal label position code {text_position}, using default")
-        if text_position[1] not in "tmb":
-            text_position = DEFAULT_VALID_TEXT_POSITION
-            logger.warning(f"button {self._button.name}: {type(self).__name__}: invalid vertical label position code {text_position}, using default")
 
         # print(f">>>> {self._button.get_id()}:{which_text}", dflt_text_font, dflt_text_size, dflt_text_color, dflt_text_position)
 
-        if text is not None and not isinstance(text, str):
-            logger.warning(f"button {self._button.name}: converting text {text} to string (type {type(text)})")
-            text = str(text)
-
-        return text, text_format, text_font, text_color, text_size, text_position
+        return text_format, text_font, text_color, text_size, text_position
 
     def get_text(self, base: dict, root: str = CONFIG_KW.LABEL.value):  # root={label|text}
         """